@@ -0,0 +1,101 @@
+import io
+import os
+import threading
+
+import pygame
+
+# Sound effect file for each event the simulation reports
+EFFECTS = {
+    'gun': 'gun_fire.mp3',
+    'hit': 'hit.mp3',
+    'death': 'death.mp3',
+    'ammo': 'ammo_pickup.mp3',
+    'roar': 'minotaur_roar.mp3',
+    'win': 'win.mp3',
+    'lose': 'lose.mp3',
+    'torch': 'torch_drop.mp3',
+}
+FALLBACK_MUSIC = 'level1_music.mp3'  # Played when a level's own music is missing
+CHANNELS = 8  # Mixer voices shared by all effects; the oldest one is cut off when all are busy
+
+_audio = {}
+
+def open_audio(directory):
+    """ One Audio per sound directory for the whole process, so effects are decoded only once """
+    directory = os.path.abspath(directory)
+    if directory not in _audio:
+        _audio[directory] = Audio(directory)
+    return _audio[directory]
+
+class Audio:
+    """ Decoded sound effects, a fixed pool of mixer channels and music read ahead of time """
+    def __init__(self, directory):
+        self.directory = directory
+        self.enabled = pygame.mixer.get_init() is not None
+        self.effects = {}
+        self.music = {}  # File name -> bytes read by a preload thread, or None if missing
+        self.loaders = {}
+        self.lock = threading.Lock()
+        if self.enabled:
+            pygame.mixer.set_num_channels(CHANNELS)
+            for event, file_name in EFFECTS.items():
+                try:
+                    self.effects[event] = pygame.mixer.Sound(os.path.join(directory, file_name))
+                except (pygame.error, OSError) as error:
+                    print(f"Could not load sound {file_name}: {error}")
+
+    def play(self, event):
+        sound = self.effects.get(event)
+        if sound:
+            # find_channel(True) hands back the longest playing voice rather than allocating a new one
+            channel = pygame.mixer.find_channel(True)
+            if channel:
+                channel.play(sound)
+
+    def preload_music(self, file_name):
+        # Read the file on a worker thread so the level change doesn't wait on the disk
+        with self.lock:
+            if file_name in self.music or file_name in self.loaders:
+                return
+            loader = threading.Thread(target=self.read_music, args=(file_name,), daemon=True)
+            self.loaders[file_name] = loader
+        loader.start()
+
+    def read_music(self, file_name):
+        try:
+            with open(os.path.join(self.directory, file_name), 'rb') as file:
+                data = file.read()
+        except OSError:
+            data = None
+        with self.lock:
+            self.music[file_name] = data
+            self.loaders.pop(file_name, None)
+
+    def music_data(self, file_name):
+        self.preload_music(file_name)
+        with self.lock:
+            loader = self.loaders.get(file_name)
+        if loader:
+            loader.join()
+        return self.music[file_name]
+
+    def play_music(self, file_name):
+        if not self.enabled:
+            return
+        data = self.music_data(file_name)
+        if data is None and file_name != FALLBACK_MUSIC:
+            print(f"Music {file_name} is missing, playing {FALLBACK_MUSIC} instead")
+            file_name = FALLBACK_MUSIC
+            data = self.music_data(file_name)
+        if data is None:
+            pygame.mixer.music.stop()
+            return
+        try:
+            pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(file_name)[1][1:])
+            pygame.mixer.music.play(-1)
+        except pygame.error as error:
+            print(f"Could not play music {file_name}: {error}")
+
+    def stop_music(self):
+        if self.enabled:
+            pygame.mixer.music.stop()
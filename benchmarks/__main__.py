@@ -0,0 +1,81 @@
+"""
+Runs every benchmark and writes the timings as JSON, optionally checking them against a baseline.
+
+python -m benchmarks --output baseline.json
+python -m benchmarks --compare baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from benchmarks import draw, mazegen, pathfinding, ticks
+
+SUITES = {"mazegen": mazegen, "ticks": ticks, "pathfinding": pathfinding, "draw": draw}
+TOLERANCE = 0.25  # A benchmark more than this fraction slower than the baseline is a regression
+
+def run(names, quick=False):
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(SUITES[name].run(quick))
+    return {
+        "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    # Prints each shared benchmark against the baseline and returns the names that got slower
+    regressions = []
+    print(f"{'Benchmark':<40}{'Baseline':>10}{'Now':>10}{'Change':>9}")
+    print("-" * 69)
+    for name, ms in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<40}{'-':>10}{ms:>10.3f}{'new':>9}")
+            continue
+        change = ms / before - 1 if before else 0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40}{before:>10.3f}{ms:>10.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark maze generation, game ticks and drawing")
+    parser.add_argument("suites", nargs="*", help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file from an earlier run to check against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--quick", action="store_true", help="fewer repeats, for a smoke test")
+    args = parser.parse_args()
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error(f"unknown suite {name}")
+
+    report = run(args.suites or list(SUITES), args.quick)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Frame cost of the renderer with more or fewer enemies and torches on the map, drawn from scratch
+and incrementally after one tick, and with the blood and bodies of many kills on the floor. Runs
+without a window through SDL's dummy video driver.
+
+Run from the project root with: python -m benchmarks.draw
+"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from glyphs import GlyphAtlas
+from renderer import Renderer
+from simulation import Simulation, LEVELS, TICK_RATE
+from headless import RandomBot
+from benchmarks.timing import measure
+
+SCREEN_SIZE = (800, 600)
+FONT_SIZE = 24
+ENEMY_COUNTS = (5, 100, 1000)
+TORCH_COUNTS = (0, 6, 50)
+KILL_COUNTS = (0, 100, 2000)
+FRAMES = 100
+
+def scene(enemies, torches):
+    # The largest preset, with torches dropped on random free tiles
+    sim = Simulation([dict(LEVELS[-1], horde=enemies, torches=torches)])
+    sim.start(0)
+    sim.hit_points = 10 ** 9
+    player = (sim.player.x, sim.player.y)
+    for _ in range(torches):
+        sim.player.x, sim.player.y = random.choice(sim.free_cells.cells)
+        sim.drop_torch()
+    sim.player.x, sim.player.y = player
+    return sim
+
+def battlefield(kills):
+    # Every enemy of a horde killed where it stands, leaving its decals behind
+    sim = scene(kills, 0)
+    for enemy in list(sim.patrolling_enemies):
+        sim.kill(enemy)
+        sim.patrolling_enemies.remove(enemy)
+    sim.events.clear()
+    return sim
+
+def run(quick=False):
+    random.seed(1)
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    glyphs = GlyphAtlas(pygame.font.Font(None, FONT_SIZE))
+    frames = FRAMES // 10 if quick else FRAMES
+    results = {}
+    for enemies in ENEMY_COUNTS:
+        for torches in TORCH_COUNTS:
+            sim = scene(enemies, torches)
+            renderer = Renderer(screen, glyphs)
+            renderer.set_level(sim)
+            renderer.draw(sim, True)
+
+            def full():
+                renderer.invalidate()
+                renderer.draw(sim, True)
+            results[f"draw/full/enemies-{enemies}/torches-{torches}"] = measure(full, number=frames)
+
+            bot = RandomBot()
+            clock = [0]
+
+            def incremental():
+                clock[0] += 1000 / TICK_RATE
+                sim.step(bot(sim), clock[0])
+                sim.events.clear()
+                renderer.draw(sim, True)
+            results[f"draw/tick/enemies-{enemies}/torches-{torches}"] = measure(incremental, number=frames)
+
+    for kills in KILL_COUNTS:
+        sim = battlefield(kills)
+        renderer = Renderer(screen, glyphs)
+        renderer.set_level(sim)
+
+        def full():
+            renderer.invalidate()
+            renderer.draw(sim, True)
+        results[f"draw/full/kills-{kills}"] = measure(full, number=frames)
+    pygame.quit()
+    return results
+
+def main():
+    print(f"{'Benchmark':<40}{'ms/frame':>10}")
+    print("-" * 50)
+    for name, ms in run().items():
+        print(f"{name:<40}{ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
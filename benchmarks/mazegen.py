@@ -0,0 +1,48 @@
+"""
+Time to generate a maze, and to build a whole level on it, for the LEVELS presets up to 1000x1000,
+and to load the same sizes from a baked level pack instead.
+
+Run from the project root with: python -m benchmarks.mazegen
+"""
+import os
+import random
+import tempfile
+
+from level import Level
+from levelpack import LevelPack, bake_dungeon, save_pack
+from maze import create_maze
+from simulation import LEVELS
+from benchmarks.timing import measure
+
+SIZES = [(level["width"], level["height"]) for level in LEVELS] + [(100, 100), (250, 250), (500, 500), (1000, 1000)]
+BACKENDS = ('list', 'grid')
+LEVEL_SIZES = SIZES[:len(LEVELS)] + [(100, 100), (250, 250)]  # Region labelling makes bigger levels slow to repeat
+
+def run(quick=False):
+    random.seed(1)
+    repeat = 1 if quick else 5
+    results = {}
+    for width, height in SIZES:
+        for backend in BACKENDS:
+            results[f"maze/{backend}/{width}x{height}"] = measure(
+                lambda: create_maze(width, height, backend, connected=True, loops=2), repeat)
+    for width, height in LEVEL_SIZES:
+        level_info = dict(LEVELS[-1], width=width, height=height)
+        results[f"level/{width}x{height}"] = measure(lambda: Level(level_info), repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in SIZES:
+            path = os.path.join(directory, f"{width}x{height}.pack")
+            maze, spawn, key_pos, exit_pos = bake_dungeon(width, height, max_rooms=15, room_min_size=3,
+                                                          room_max_size=7, connected=True, loops=2)
+            save_pack(path, maze, width, height, spawn, key_pos, exit_pos)
+            results[f"pack/{width}x{height}"] = measure(lambda: LevelPack(path), repeat)
+    return results
+
+def main():
+    print(f"{'Benchmark':<28}{'ms':>10}")
+    print("-" * 38)
+    for name, ms in run().items():
+        print(f"{name:<28}{ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-tick cost of minotaur pathfinding as the number of minotaurs grows.
+
+Run from the project root with: python -m benchmarks.pathfinding
+"""
+import random
+import time
+
+from entities import Minotaur, Player
+from maze import create_maze
+from pathfinding import DistanceField
+
+MINOTAUR_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+TICKS = 200
+WIDTH, HEIGHT = 60, 50  # Largest of the LEVELS presets
+
+def free_tiles(maze):
+    return [(x, y) for y, row in enumerate(maze) for x, tile in enumerate(row) if tile == ' ']
+
+def walk(player, maze):
+    # The player changes tile every tick, which forces a new field every tick (the worst case)
+    while True:
+        dx, dy = random.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+        if maze[player.y + dy][player.x + dx] == ' ':
+            player.x += dx
+            player.y += dy
+            return
+
+def shared_field(maze, player, minotaurs):
+    field = DistanceField(maze, WIDTH, HEIGHT)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        walk(player, maze)
+        field.update(player.x, player.y)
+        for minotaur in minotaurs:
+            minotaur.chase(maze, player, distance_field=field)
+    return (time.perf_counter() - start) * 1000 / TICKS
+
+def field_per_minotaur(maze, player, minotaurs):
+    # What searching separately for every minotaur would cost
+    fields = [DistanceField(maze, WIDTH, HEIGHT) for _ in minotaurs]
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        walk(player, maze)
+        for minotaur, field in zip(minotaurs, fields):
+            field.update(player.x, player.y)
+            minotaur.chase(maze, player, distance_field=field)
+    return (time.perf_counter() - start) * 1000 / TICKS
+
+def run(quick=False):
+    random.seed(1)
+    maze, _ = create_maze(WIDTH, HEIGHT)
+    tiles = free_tiles(maze)
+    counts = MINOTAUR_COUNTS[:4] if quick else MINOTAUR_COUNTS
+
+    results = {}
+    for count in counts:
+        for name, bench in (("shared", shared_field), ("per-minotaur", field_per_minotaur)):
+            player = Player(*random.choice(tiles))
+            minotaurs = [Minotaur(*random.choice(tiles), hp=1) for _ in range(count)]
+            results[f"chase/{name}/{count}"] = bench(maze, player, minotaurs)
+    return results
+
+def main():
+    results = run()
+    print(f"{'Minotaurs':<12}{'Shared (ms/tick)':<20}{'Per minotaur (ms/tick)':<24}")
+    print("-" * 56)
+    for count in MINOTAUR_COUNTS:
+        print(f"{count:<12}{results[f'chase/shared/{count}']:<20.3f}{results[f'chase/per-minotaur/{count}']:<24.3f}")
+
+if __name__ == "__main__":
+    main()
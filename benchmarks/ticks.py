@@ -0,0 +1,69 @@
+"""
+Per-tick cost of the game logic: whole Simulation steps, bullets in flight and patrolling hordes.
+
+Run from the project root with: python -m benchmarks.ticks
+"""
+import random
+
+from entities import patrol_all
+from simulation import Simulation, LEVELS, TICK_RATE
+from headless import RandomBot
+from benchmarks.timing import measure
+
+TICKS = 500
+BULLET_COUNTS = (10, 100, 400)
+HORDE_SIZES = (100, 1000, 5000)
+
+def step_cost(levels, ticks):
+    # A bot plays the level with hit points to spare, so a death doesn't end the run part way
+    sim = Simulation(levels)
+    sim.start(0)
+    sim.hit_points = 10 ** 9
+    bot = RandomBot()
+    clock = [0]
+
+    def tick():
+        sim.step(bot(sim), clock[0])
+        sim.events.clear()
+        clock[0] += 1000 / TICK_RATE
+    return measure(lambda: [tick() for _ in range(ticks)]) / ticks
+
+def bullet_cost(count, ticks):
+    # Keeps count bullets in flight, refilling those that hit a wall outside the timed update
+    sim = Simulation()
+    cells = sim.free_cells.cells
+    total = 0
+    for _ in range(ticks):
+        while len(sim.projectiles) < count:
+            x, y = random.choice(cells)
+            dx, dy = random.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            sim.occupancy.add('bullet', (x, y), sim.projectiles.spawn(x, y, dx, dy))
+        total += measure(sim.update_bullets, repeat=1)
+    return total / ticks
+
+def patrol_cost(size):
+    sim = Simulation([dict(LEVELS[-1], horde=size)])
+    return measure(lambda: patrol_all(sim.patrolling_enemies, sim.distance_field.open, sim.width, sim.occupancy), number=20)
+
+def run(quick=False):
+    random.seed(1)
+    ticks = TICKS // 10 if quick else TICKS
+    results = {}
+    for i, level in enumerate(LEVELS):
+        results[f"tick/level{i + 1}"] = step_cost([level], ticks)
+    for size in HORDE_SIZES:
+        results[f"tick/horde-{size}"] = step_cost([dict(LEVELS[-1], horde=size)], ticks)
+    for count in BULLET_COUNTS:
+        results[f"bullets/{count}"] = bullet_cost(count, ticks)
+    for size in HORDE_SIZES:
+        results[f"patrol/{size}"] = patrol_cost(size)
+    return results
+
+def main():
+    print(f"{'Benchmark':<28}{'ms/tick':>10}")
+    print("-" * 38)
+    for name, ms in run().items():
+        print(f"{name:<28}{ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import statistics
+import time
+
+def measure(fn, repeat=5, number=1):
+    # Median milliseconds per call over repeat rounds of number calls; the median shrugs off one-off stalls
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) * 1000 / number)
+    return statistics.median(rounds)
@@ -0,0 +1,49 @@
+from collections import deque
+
+from maze import EMPTY
+
+DECAL_LIMIT = 400  # Tiles that can hold a decal at once; stamping more clears the oldest
+
+# Decal kinds by their byte in the grid, 0 being bare floor. A higher kind covers a lower one
+KINDS = (None, 'body', 'blood')
+
+class Decals:
+    """
+    Blood and bodies left on the floor of one level, one byte per tile. At most limit tiles are
+    marked, so memory and drawing cost stay the same however many enemies die.
+    """
+    def __init__(self, maze, width, height, limit=DECAL_LIMIT):
+        self.maze = maze
+        self.width = width
+        self.limit = limit
+        self.grid = bytearray(width * height)
+        self.order = deque()  # Marked tiles, oldest first
+        self.changed = set()
+
+    def stamp(self, kind, x, y):
+        # Walls and traps are drawn over anything on them, so only open floor takes decals
+        if self.maze[y][x] != EMPTY:
+            return
+        i = y * self.width + x
+        code = KINDS.index(kind)
+        if self.grid[i] >= code:
+            return
+        if not self.grid[i]:
+            self.order.append(i)
+            if len(self.order) > self.limit:
+                oldest = self.order.popleft()
+                self.grid[oldest] = 0
+                self.changed.add(oldest)
+        self.grid[i] = code
+        self.changed.add(i)
+
+    def get(self, x, y):
+        return KINDS[self.grid[y * self.width + x]]
+
+    def __len__(self):
+        return len(self.order)
+
+    def drain(self):
+        # Tiles stamped or cleared since the last call, as (x, y)
+        changed, self.changed = self.changed, set()
+        return [(i % self.width, i // self.width) for i in changed]
@@ -0,0 +1,144 @@
+"""
+Generates many dungeons with create_dungeon on a pool of processes and reports how they come out,
+for tuning the generator options of LEVELS. The options default to the ones LEVELS uses, so the
+statistics describe the dungeons players get. Map i is generated from seed str(first_seed + i), the
+same seed `levelpack.py bake --seed` takes; measured with --backend grid, a good map can be baked into
+a pack as it was measured.
+
+python dungeonstats.py --maps 20000 --width 60 --height 50
+python dungeonstats.py --maps 20000 --max-rooms 25 --room-max-size 9 --tiles-per-trap 30
+python dungeonstats.py --maps 20000 --best 10 --best-by path --save-best best.json
+python dungeonstats.py --maps 20000 --backend grid --chained
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from maze import GridMaze, TILES_PER_TRAP, WALL, TRAP
+from pathfinding import DistanceField, label_regions
+from levelpack import bake_dungeon
+
+# Reported for every map: rooms placed, share of the interior that is floor or trap, traps,
+# connected regions of floor, and steps from the spawn to the key and on to the exit (-1 if cut off)
+METRICS = ('rooms', 'open_ratio', 'traps', 'regions', 'path')
+CHUNK = 100  # Maps per task handed to a worker
+BINS = 10  # Histogram bars per metric
+BAR_WIDTH = 40
+
+def analyze(seed, width, height, options):
+    """ Generates the map for seed with bake_dungeon and returns its METRICS """
+    rooms = []
+    maze, spawn, key_pos, exit_pos = bake_dungeon(width, height, random.Random(seed), rooms=rooms, **options)
+    interior = (width - 2) * (height - 2)
+    if isinstance(maze, GridMaze):
+        walls, traps = maze.tiles.count(ord(WALL)), maze.tiles.count(ord(TRAP))
+    else:
+        walls, traps = sum(row.count(WALL) for row in maze), sum(row.count(TRAP) for row in maze)
+    _, sizes = label_regions(maze, width, height)
+    field = DistanceField(maze, width, height)
+    field.update(*spawn)
+    to_key = field.distance(*key_pos)
+    field.update(*key_pos)
+    to_exit = field.distance(*exit_pos)
+    return {
+        'rooms': len(rooms),
+        'open_ratio': (width * height - walls) / interior,
+        'traps': traps,
+        'regions': len(sizes),
+        'path': to_key + to_exit if to_key >= 0 and to_exit >= 0 else -1,
+    }
+
+def analyze_chunk(first, count, width, height, options):
+    # Runs in a worker process; each map has its own seed, so results don't depend on which worker ran it
+    return [(str(seed), analyze(str(seed), width, height, options)) for seed in range(first, first + count)]
+
+def stream(maps, first_seed, width, height, options, workers=None):
+    """ Yields (seed, metrics) for every map, chunk by chunk in seed order, as the workers finish them """
+    chunks = [(start, min(CHUNK, first_seed + maps - start)) for start in range(first_seed, first_seed + maps, CHUNK)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(analyze_chunk, start, count, width, height, options) for start, count in chunks]
+        for future in futures:
+            yield from future.result()
+
+def histogram(values, bins=BINS):
+    """ [(low, high, count)] over equal-width bins; whole numbers get one bin per value when they fit """
+    low, high = min(values), max(values)
+    if all(isinstance(value, int) for value in values) and high - low < bins:
+        return [(value, value, values.count(value)) for value in range(low, high + 1)]
+    step = (high - low) / bins or 1
+    counts = [0] * bins
+    for value in values:
+        counts[min(bins - 1, int((value - low) / step))] += 1
+    return [(low + i * step, low + (i + 1) * step, count) for i, count in enumerate(counts)]
+
+def print_histogram(name, values):
+    print(f"{name}: min {min(values):g}  mean {sum(values) / len(values):.3f}  max {max(values):g}")
+    bars = histogram(values)
+    most = max(count for _, _, count in bars)
+    for low, high, count in bars:
+        label = f"{low:g}" if low == high else f"{low:.3g}-{high:.3g}"
+        print(f"  {label:>15} | {'#' * round(BAR_WIDTH * count / most):<{BAR_WIDTH}} {count}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate dungeons in parallel and report statistics about them")
+    parser.add_argument("--maps", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first map; map i uses seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--width", type=int, default=60)
+    parser.add_argument("--height", type=int, default=50)
+    parser.add_argument("--backend", choices=('list', 'grid'), default='list')
+    parser.add_argument("--chained", action="store_true",
+                        help="chain each room to the one placed before it instead of linking them with a spanning tree")
+    parser.add_argument("--max-rooms", type=int, default=15)
+    parser.add_argument("--room-min-size", type=int, default=3)
+    parser.add_argument("--room-max-size", type=int, default=7)
+    parser.add_argument("--loops", type=int, default=2)
+    parser.add_argument("--tiles-per-trap", type=int, default=TILES_PER_TRAP)
+    parser.add_argument("--best", type=int, default=10, help="how many of the best maps to keep")
+    parser.add_argument("--best-by", choices=METRICS, default='path', help="metric the best maps have most of")
+    parser.add_argument("--save-best", metavar="PATH", help="write the best seeds and their metrics to this JSON file")
+    parser.add_argument("--output", help="write every histogram to this JSON file")
+    args = parser.parse_args()
+
+    options = {"backend": args.backend, "max_rooms": args.max_rooms, "room_min_size": args.room_min_size,
+               "room_max_size": args.room_max_size, "connected": not args.chained, "loops": args.loops, "tiles_per_trap": args.tiles_per_trap}
+    values = {name: [] for name in METRICS}
+    best = []  # Min-heap of (metric, seed number, seed, metrics) holding the best args.best maps
+    start = time.perf_counter()
+    for done, (seed, metrics) in enumerate(stream(args.maps, args.seed, args.width, args.height, options, args.workers), 1):
+        for name in METRICS:
+            values[name].append(metrics[name])
+        entry = (metrics[args.best_by], -int(seed), seed, metrics)
+        if len(best) < args.best:
+            heapq.heappush(best, entry)
+        elif args.best:
+            heapq.heappushpop(best, entry)
+        if done % (CHUNK * 10) == 0:
+            print(f"{done}/{args.maps} maps", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.maps} maps of {args.width}x{args.height} in {elapsed:.1f}s ({args.maps / elapsed:.0f} maps/s)\n")
+    for name in METRICS:
+        print_histogram(name, values[name])
+    best = [dict(seed=seed, **metrics) for _, _, seed, metrics in sorted(best, reverse=True)]
+    print(f"Best by {args.best_by}:")
+    for entry in best:
+        print("  " + "  ".join(f"{key} {value:.3g}" if isinstance(value, float) else f"{key} {value}" for key, value in entry.items()))
+
+    settings = {"width": args.width, "height": args.height, **options}
+    if args.save_best:
+        with open(args.save_best, 'w') as file:
+            json.dump({"settings": settings, "best_by": args.best_by, "maps": best}, file, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({"settings": settings, "maps": args.maps,
+                       "histograms": {name: histogram(values[name]) for name in METRICS}}, file, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import random
 
 WALL = '#'
+PATROL_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))  # Picked by the low two bits of a random byte
+
+# Entities use __slots__: no per-instance dict, so hordes of thousands stay small and quick to update
 
 class Player:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -15,13 +20,21 @@ class Player:
             self.y = new_y
 
 class Minotaur:
+    __slots__ = ('x', 'y', 'hp')
+    layer = 'minotaur'
+
     def __init__(self, x, y, hp):
         self.x = x
         self.y = y
         self.hp = hp
 
-    def chase(self, maze, player):
-        if player.x > self.x and maze[self.y][self.x + 1] != WALL:
+    def chase(self, maze, player, occupancy=None, distance_field=None):
+        old_pos = (self.x, self.y)
+        step = distance_field.step(self.x, self.y) if distance_field is not None else None
+        if step is not None:
+            # Walk downhill on the shared distance field towards the player
+            self.x, self.y = step
+        elif player.x > self.x and maze[self.y][self.x + 1] != WALL:
             self.x += 1
         elif player.x < self.x and maze[self.y][self.x - 1] != WALL:
             self.x -= 1
@@ -29,17 +42,27 @@ class Minotaur:
             self.y += 1
         elif player.y < self.y and maze[self.y - 1][self.x] != WALL:
             self.y -= 1
+        if occupancy is not None:
+            occupancy.move(self, old_pos)
 
 class PatrollingEnemy:
+    __slots__ = ('x', 'y')
+    layer = 'enemy'
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
-    def patrol(self, maze):
-        dx, dy = random.choice(self.directions)
-        new_x = self.x + dx
-        new_y = self.y + dy
-        if maze[new_y][new_x] != WALL:
-            self.x = new_x
-            self.y = new_y
+def patrol_all(enemies, walkable, width, occupancy=None, rng=random):
+    """ One patrol step for every enemy from a single random draw, checked against a flat open-tile mask """
+    rolls = rng.randbytes(len(enemies))
+    for enemy, roll in zip(enemies, rolls):
+        dx, dy = PATROL_DIRECTIONS[roll & 3]
+        new_x = enemy.x + dx
+        new_y = enemy.y + dy
+        if walkable[new_y * width + new_x]:
+            old_pos = (enemy.x, enemy.y)
+            enemy.x = new_x
+            enemy.y = new_y
+            if occupancy is not None:
+                occupancy.move(enemy, old_pos)
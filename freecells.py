@@ -0,0 +1,96 @@
+import random
+
+from maze import EMPTY
+from pathfinding import DistanceField, label_regions
+
+PROBES = 8  # Random tries before a distance query falls back to scanning every free cell
+KEY_EXIT_DISTANCE = 10  # Fewest steps from the spawn to the key and from the key to the exit
+
+def manhattan(origin):
+    return lambda cell: abs(cell[0] - origin[0]) + abs(cell[1] - origin[1])
+
+def chebyshev(origin):
+    return lambda cell: max(abs(cell[0] - origin[0]), abs(cell[1] - origin[1]))
+
+def walking(distance_field):
+    # True path distance from the field's target; negative for cells it can't reach
+    return lambda cell: distance_field.distance(*cell)
+
+class FreeCells:
+    """ Every empty interior tile of a level, sampled uniformly without replacement in O(1) """
+    def __init__(self, maze, width, height, keep=None, rng=random):
+        # keep(cell) can restrict the index, e.g. to the tiles of one connected region;
+        # rng is the random.Random every sample is drawn from
+        self.rng = rng
+        self.cells = [(x, y) for y in range(1, height - 1) for x in range(1, width - 1)
+                      if maze[y][x] == EMPTY and (keep is None or keep((x, y)))]
+        self.positions = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def take(self, cell):
+        # Swap the cell with the last one so removal is O(1)
+        i = self.positions.pop(cell)
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.positions[last] = i
+
+    def sample(self, take=True):
+        if not self.cells:
+            return None
+        cell = self.cells[self.rng.randrange(len(self.cells))]
+        if take:
+            self.take(cell)
+        return cell
+
+    def sample_band(self, distance, min_distance=0, max_distance=None, take=True):
+        """
+        Random free cell whose distance(cell) lies in [min_distance, max_distance]. distance may be
+        manhattan(), chebyshev() or walking(), whose negative values mean unreachable.
+        When no cell is far enough the farthest one is returned, so the query always ends.
+        """
+        if not self.cells:
+            return None
+
+        def in_band(cell):
+            d = distance(cell)
+            return d >= 0 and d >= min_distance and (max_distance is None or d <= max_distance)
+
+        cell = None
+        for _ in range(PROBES):
+            probe = self.cells[self.rng.randrange(len(self.cells))]
+            if in_band(probe):
+                cell = probe
+                break
+        else:
+            candidates = [candidate for candidate in self.cells if in_band(candidate)]
+            if candidates:
+                cell = self.rng.choice(candidates)
+            else:
+                cell = max(self.cells, key=distance)
+
+        if take:
+            self.take(cell)
+        return cell
+
+def region_cells(maze, width, height, rng=random, origin=None):
+    """
+    FreeCells over one connected region: the one holding origin, or else the largest, so
+    everything placed from it can be reached from everything else.
+    """
+    labels, sizes = label_regions(maze, width, height)
+    if origin is None:
+        region = sizes.index(max(sizes))
+    else:
+        region = labels[origin[1] * width + origin[0]]
+    return FreeCells(maze, width, height, lambda cell: labels[cell[1] * width + cell[0]] == region, rng)
+
+def place_key_and_exit(free_cells, maze, width, height, spawn_field):
+    # The key at least KEY_EXIT_DISTANCE steps from the spawn field's target, the exit as far again from the key
+    key_pos = free_cells.sample_band(walking(spawn_field), KEY_EXIT_DISTANCE)
+    key_field = DistanceField(maze, width, height)
+    key_field.update(*key_pos)
+    exit_pos = free_cells.sample_band(walking(key_field), KEY_EXIT_DISTANCE)
+    return key_pos, exit_pos
@@ -0,0 +1,42 @@
+# Character and colour for every kind of tile the map can show
+GLYPHS = {
+    'floor': (' ', (255, 255, 255)),
+    'wall': ('#', (255, 255, 255)),
+    'trap': ('^', (128, 128, 128)),  # Grey color for traps
+    'player': ('@', (0, 255, 0)),
+    'minotaur': ('M', (255, 0, 0)),
+    'key': ('K', (255, 215, 0)),
+    'exit': ('E', (0, 0, 255)),
+    'enemy': ('P', (255, 0, 255)),
+    'bullet': ('*', (255, 255, 0)),
+    'ammo': ('A', (255, 255, 0)),
+    'blood': ('+', (139, 0, 0)),  # Blood red
+    'body': ('b', (139, 0, 0)),  # Dark red for body
+    'torch': ('T', (255, 140, 0)),  # Orange for torch
+}
+
+class GlyphAtlas:
+    """ Rasterizes each glyph and text line once and hands back the cached surface """
+    def __init__(self, font):
+        self.font = font
+        self.tiles = {name: font.render(char, True, color) for name, (char, color) in GLYPHS.items()}
+        self.texts = {}
+        self.labels = {}
+
+    def tile(self, name):
+        return self.tiles[name]
+
+    def text(self, text, color):
+        surface = self.texts.get((text, color))
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.texts[(text, color)] = surface
+        return surface
+
+    def label(self, name, text, color):
+        # HUD lines are re-rendered only when the text they show changes
+        cached = self.labels.get(name)
+        if cached is None or cached[0] != text or cached[1] != color:
+            cached = (text, color, self.font.render(text, True, color))
+            self.labels[name] = cached
+        return cached[2]
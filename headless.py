@@ -0,0 +1,73 @@
+"""
+Runs the simulation without pygame or a display, as fast as it will go, with a bot at the controls.
+
+python headless.py --ticks 100000 --seed 1
+python headless.py --ticks 10000 --horde 5000
+"""
+import argparse
+import random
+import time
+
+from simulation import Simulation, LEVELS, TICK_RATE, UP, DOWN, LEFT, RIGHT, SHOOT, TORCH
+
+TICK_MS = 1000 / TICK_RATE  # Simulated time per tick
+
+class RandomBot:
+    """ Wanders in one direction for a while, shooting and dropping torches now and then """
+    def __init__(self):
+        self.direction = UP
+
+    def __call__(self, sim):
+        if random.random() < 0.05:
+            self.direction = random.choice((UP, DOWN, LEFT, RIGHT))
+        action = self.direction
+        if random.random() < 0.02:
+            action |= SHOOT
+        if random.random() < 0.002:
+            action |= TORCH
+        return action
+
+def run(ticks, bot=None, tick_ms=TICK_MS, levels=LEVELS):
+    bot = bot or RandomBot()
+    stats = {"ticks": ticks, "runs": 1, "wins": 0, "losses": 0, "levels": 0, "kills": 0}
+
+    sim = Simulation(levels)
+    sim.start(0)
+    for tick in range(ticks):
+        now = tick * tick_ms
+        sim.step(bot(sim), now)
+        for event in sim.events:
+            if event == 'level':
+                stats["levels"] += 1
+            elif event == 'death':
+                stats["kills"] += 1
+        sim.events.clear()
+
+        if sim.outcome is not None:
+            stats["wins" if sim.level >= len(sim.levels) else "losses"] += 1
+            stats["runs"] += 1
+            sim = Simulation(levels)
+            sim.start(now)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game simulation headless")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--horde", type=int, help="start every level with this many patrolling enemies")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    start = time.perf_counter()
+    levels = LEVELS
+    if args.horde:
+        levels = [dict(level, horde=args.horde) for level in LEVELS]
+    stats = run(args.ticks, levels=levels)
+    elapsed = time.perf_counter() - start
+    print(f"{args.ticks} ticks in {elapsed:.2f}s ({args.ticks / elapsed:.0f} ticks/s, "
+          f"{args.ticks * TICK_MS / 1000 / elapsed:.0f}x real time)")
+    print(", ".join(f"{name}: {value}" for name, value in stats.items() if name != "ticks"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from maze import create_maze
+from levelpack import LevelPack
+from entities import Player, Minotaur, PatrollingEnemy
+from occupancy import Occupancy
+from visibility import Visibility
+from decals import Decals
+from pathfinding import DistanceField
+from freecells import chebyshev, region_cells, place_key_and_exit
+
+AMMO_PICKUPS = 5  # Ammo boxes placed on each level
+PATROLLING_ENEMIES = 5  # Patrolling enemies a level starts with, unless it sets "horde"
+
+_executor = None
+
+def level_executor():
+    # One worker thread for the whole process, however many games are started
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level')
+    return _executor
+
+def level_rng(seed, index):
+    # Each level has its own generator, so it comes out the same whichever thread builds it and when
+    if seed is None:
+        return random
+    return random.Random(f"{seed}/{index}")
+
+class Level:
+    """
+    A freshly generated level: the maze and where the player, monsters, key, exit and ammo start.
+    It shares nothing with the running game, so it can be built on another thread or process.
+    A level_info with a "pack" loads its maze, spawn, key and exit from a baked pack instead.
+    """
+    def __init__(self, level_info, line_of_sight=True, player_radius=0, rng=random):
+        self.torches = level_info["torches"]
+        self.minotaur_speed = level_info["minotaur_speed"]
+        self.music = level_info["music"]
+
+        pack = LevelPack(level_info["pack"]) if "pack" in level_info else None
+        if pack:
+            self.width = width = pack.width
+            self.height = height = pack.height
+            self.maze, self.player_start = pack.maze, pack.spawn
+        else:
+            self.width = width = level_info["width"]
+            self.height = height = level_info["height"]
+            self.maze, self.player_start = create_maze(width, height, level_info.get("backend", "list"),
+                                                       level_info.get("connected", True), level_info.get("loops", 2), rng)
+
+        # Everything spawns in one region so all of it can be reached: the largest, or for a pack the
+        # spawn's, which was checked to reach its key and exit when it was baked
+        self.free_cells = region_cells(self.maze, width, height, rng, pack.spawn if pack else None)
+        if pack:
+            for cell in (pack.spawn, pack.key_pos, pack.exit_pos):
+                self.free_cells.take(cell)
+            self.player = Player(*pack.spawn)
+        else:
+            self.player = Player(*self.free_cells.sample())
+
+        # One walking-distance map from the player shared by every minotaur
+        self.distance_field = DistanceField(self.maze, width, height)
+        self.distance_field.update(self.player.x, self.player.y)
+
+        # Minotaurs, key and exit go in empty spaces, the key and exit far apart by path
+        self.minotaurs = [Minotaur(*self.free_cells.sample(), level_info["minotaur_hp"]) for _ in range(level_info["minotaurs"])]
+        if pack:
+            self.key_pos, self.exit_pos = pack.key_pos, pack.exit_pos
+        else:
+            self.key_pos, self.exit_pos = place_key_and_exit(self.free_cells, self.maze, width, height, self.distance_field)
+        self.ammo_positions = [self.free_cells.sample() for _ in range(AMMO_PICKUPS)]
+
+        # Patrolling enemies start more than 4 tiles from the player on either axis
+        away = chebyshev((self.player.x, self.player.y))
+        self.patrolling_enemies = [PatrollingEnemy(*self.free_cells.sample_band(away, 5, take=False))
+                                   for _ in range(level_info.get("horde", PATROLLING_ENEMIES))]
+
+        # Tile index of everything on the map; torches carried over from earlier levels are added on swap
+        self.occupancy = Occupancy()
+        for entity in self.minotaurs + self.patrolling_enemies:
+            self.occupancy.add(entity.layer, (entity.x, entity.y), entity)
+        for ammo in self.ammo_positions:
+            self.occupancy.add('ammo', ammo)
+
+        self.visibility = Visibility(self.maze, width, height, line_of_sight)
+        self.visibility.set_source('player', self.player.x, self.player.y, player_radius)
+        self.decals = Decals(self.maze, width, height)
+
+class LevelPipeline:
+    """ Builds the next level in the background while the current one is played """
+    def __init__(self, levels, executor=None, seed=None, **options):
+        # Any concurrent.futures executor works; a ProcessPoolExecutor keeps very large maps off this process.
+        # With a seed every level is reproducible; without one they come from the global random module.
+        self.levels = levels
+        self.seed = seed
+        self.executor = executor or level_executor()
+        self.options = options
+        self.pending = {}
+
+    def prepare(self, index):
+        if index < len(self.levels) and index not in self.pending:
+            self.pending[index] = self.executor.submit(Level, self.levels[index], rng=level_rng(self.seed, index), **self.options)
+
+    def take(self, index):
+        # The prepared level if one was started (waiting for it if it isn't done), else built right here
+        future = self.pending.pop(index, None)
+        if future is not None:
+            return future.result()
+        return Level(self.levels[index], rng=level_rng(self.seed, index), **self.options)
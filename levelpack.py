@@ -0,0 +1,173 @@
+"""
+Baked levels: a fixed header with the size and the spawn, key and exit tiles, then the maze as one
+byte per tile, the same layout a GridMaze keeps in memory. Loading a pack memory-maps the file and
+hands the tiles to a GridMaze as they are, so even a huge map loads without parsing or copying.
+
+python levelpack.py bake levels/cavern.pack --width 300 --height 200 --seed 7
+python levelpack.py bake levels/crypt.pack --text crypt.txt   # '#' wall, '^' trap, '@' spawn, 'K' key, 'E' exit
+python levelpack.py show levels/cavern.pack
+
+A LEVELS entry uses a pack with "pack": "levels/cavern.pack" in place of "width" and "height".
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+
+from maze import GridMaze, create_dungeon, TILES_PER_TRAP, WALL, EMPTY, TRAP
+from pathfinding import DistanceField
+from freecells import region_cells, place_key_and_exit
+
+MAGIC = b'MINOPACK'
+VERSION = 1
+# Magic, version, width, height, then the x and y of the spawn, key and exit
+HEADER = struct.Struct('<8sHHHHHHHHH')
+MARKERS = {'@': 'spawn', 'K': 'key', 'E': 'exit'}  # Placed on an empty tile in text maps
+
+class PackedMaze(GridMaze):
+    """ A GridMaze over a pack's mapped tiles. It pickles as the pack's path and maps the file again on load """
+    def __init__(self, path, width, height, tiles):
+        super().__init__(width, height, tiles)
+        self.path = path
+
+    def __reduce__(self):
+        return load_maze, (self.path,)
+
+def load_maze(path):
+    return LevelPack(path).maze
+
+class LevelPack:
+    """ A baked level mapped from disk; maze reads its tiles straight out of the mapping """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            raise ValueError(f"{path} is not a level pack")
+        magic, version, width, height, sx, sy, kx, ky, ex, ey = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a level pack")
+        if len(self.data) != HEADER.size + width * height:
+            raise ValueError(f"{path} is truncated")
+        self.width = width
+        self.height = height
+        self.spawn = (sx, sy)
+        self.key_pos = (kx, ky)
+        self.exit_pos = (ex, ey)
+        self.maze = PackedMaze(path, width, height, memoryview(self.data)[HEADER.size:])
+
+def save_pack(path, maze, width, height, spawn, key_pos, exit_pos):
+    # Writes to a temporary file first so a failed bake never leaves half a pack behind
+    if isinstance(maze, GridMaze):
+        tiles = bytes(maze.tiles)
+    else:
+        tiles = ''.join(''.join(row) for row in maze).encode('latin-1')
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, width, height, *spawn, *key_pos, *exit_pos))
+        file.write(tiles)
+    os.replace(temp_path, path)
+
+def validate(maze, width, height, spawn, key_pos, exit_pos):
+    """
+    Raises ValueError unless the map is walled all round and the spawn, key and exit are on open
+    floor joined by a path. Nothing in the game checks bounds, so a gap in the outer ring would let
+    the player walk off the map.
+    """
+    for y in range(height):
+        for x in (range(width) if y in (0, height - 1) else (0, width - 1)):
+            if maze[y][x] != WALL:
+                raise ValueError(f"the outer wall has a gap at {(x, y)}")
+    if len({spawn, key_pos, exit_pos}) < 3:
+        raise ValueError("the spawn, key and exit must be on different tiles")
+    for name, (x, y) in (('spawn', spawn), ('key', key_pos), ('exit', exit_pos)):
+        if not (0 < x < width - 1 and 0 < y < height - 1) or maze[y][x] != EMPTY:
+            raise ValueError(f"the {name} at {(x, y)} is not on an empty tile")
+    field = DistanceField(maze, width, height)
+    field.update(*spawn)
+    if field.distance(*key_pos) < 0:
+        raise ValueError("the key can't be reached from the spawn")
+    field.update(*key_pos)
+    if field.distance(*exit_pos) < 0:
+        raise ValueError("the exit can't be reached from the key")
+
+def bake_dungeon(width, height, rng=random, backend='grid', **options):
+    """
+    Generates a dungeon with create_dungeon and places the spawn, key and exit the way Level does:
+    all in the largest region, the key and exit far apart by path. Returns (maze, spawn, key, exit).
+    """
+    maze, _ = create_dungeon(width, height, backend=backend, rng=rng, **options)
+    free_cells = region_cells(maze, width, height, rng)
+    spawn = free_cells.sample()
+    field = DistanceField(maze, width, height)
+    field.update(*spawn)
+    key_pos, exit_pos = place_key_and_exit(free_cells, maze, width, height, field)
+    return maze, spawn, key_pos, exit_pos
+
+def read_text(path):
+    """ Parses a hand-drawn map into (maze, width, height, spawn, key, exit). Short rows are padded with wall """
+    with open(path, 'r') as file:
+        rows = [line.rstrip('\n') for line in file]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    width, height = max(map(len, rows), default=0), len(rows)
+    maze = GridMaze(width, height)
+    found = {}
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            if char in MARKERS:
+                if MARKERS[char] in found:
+                    raise ValueError(f"{path} has more than one {MARKERS[char]}")
+                found[MARKERS[char]] = (x, y)
+                char = EMPTY
+            elif char not in (WALL, EMPTY, TRAP):
+                raise ValueError(f"{path}: unknown tile {char!r} at {(x, y)}")
+            maze[y][x] = char
+    missing = [name for name in MARKERS.values() if name not in found]
+    if missing:
+        raise ValueError(f"{path} has no {', '.join(missing)}")
+    return maze, width, height, found['spawn'], found['key'], found['exit']
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake level packs and inspect them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bake = commands.add_parser("bake", help="generate a dungeon, or read a text map, into a pack")
+    bake.add_argument("path")
+    bake.add_argument("--text", help="hand-drawn map to bake instead of generating one")
+    bake.add_argument("--width", type=int, default=60)
+    bake.add_argument("--height", type=int, default=50)
+    bake.add_argument("--seed", help="seed for the generator (default: random)")
+    bake.add_argument("--max-rooms", type=int, default=15)
+    bake.add_argument("--room-min-size", type=int, default=3)
+    bake.add_argument("--room-max-size", type=int, default=7)
+    bake.add_argument("--loops", type=int, default=2)
+    bake.add_argument("--tiles-per-trap", type=int, default=TILES_PER_TRAP)
+    show = commands.add_parser("show", help="print a pack's header and map")
+    show.add_argument("path")
+    show.add_argument("--header", action="store_true", help="only the header")
+    args = parser.parse_args()
+
+    if args.command == "bake":
+        try:
+            if args.text:
+                maze, width, height, spawn, key_pos, exit_pos = read_text(args.text)
+            else:
+                width, height = args.width, args.height
+                maze, spawn, key_pos, exit_pos = bake_dungeon(
+                    width, height, random.Random(args.seed), max_rooms=args.max_rooms, room_min_size=args.room_min_size,
+                    room_max_size=args.room_max_size, connected=True, loops=args.loops, tiles_per_trap=args.tiles_per_trap)
+            validate(maze, width, height, spawn, key_pos, exit_pos)
+        except ValueError as error:
+            parser.error(str(error))
+        save_pack(args.path, maze, width, height, spawn, key_pos, exit_pos)
+        print(f"{args.path}: {width}x{height}, spawn {spawn}, key {key_pos}, exit {exit_pos}")
+    else:
+        pack = LevelPack(args.path)
+        print(f"{args.path}: {pack.width}x{pack.height}, spawn {pack.spawn}, key {pack.key_pos}, exit {pack.exit_pos}")
+        if not args.header:
+            markers = {pack.spawn: '@', pack.key_pos: 'K', pack.exit_pos: 'E'}
+            for y, row in enumerate(pack.maze):
+                print(''.join(markers.get((x, y), char) for x, char in enumerate(row)))
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import pygame
-from game import Game
+from game import Game, TITLE
 from start_screen import StartScreen
 
 def main():
@@ -8,14 +8,10 @@ def main():
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Escape the Minotaur!")
 
-    start_screen = StartScreen(screen)
-    while True:
-        choice = start_screen.show()
-        if choice == "start":
-            game = Game(screen)
-            game.run()
-        elif choice == "scores":
-            start_screen.display_scores()
+    # One Game for the whole session; it returns once the window is closed
+    game = Game(screen, title_screen=StartScreen(screen))
+    game.run(TITLE)
+    pygame.quit()
 
 if __name__ == "__main__":
     main()
@@ -3,29 +3,156 @@ import random
 WALL = '#'
 EMPTY = ' '
 TRAP = '^'
+TILES_PER_TRAP = 15  # One trap probe per this many tiles of the map
+
+TILE_CHARS = [chr(code) for code in range(256)]
+EMPTY_FLAGS = bytes(code == ord(EMPTY) for code in range(256))  # Maps a tile byte to 1 if empty, else 0
+
+class GridRow:
+    __slots__ = ('tiles', 'offset', 'width')
+
+    def __init__(self, tiles, offset, width):
+        self.tiles = tiles
+        self.offset = offset
+        self.width = width
+
+    def __getitem__(self, x):
+        return TILE_CHARS[self.tiles[self.offset + x]]
+
+    def __setitem__(self, x, tile):
+        self.tiles[self.offset + x] = ord(tile)
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return (TILE_CHARS[code] for code in self.tiles[self.offset:self.offset + self.width])
+
+class GridMaze:
+    """ One byte per tile in a flat buffer, read and written as maze[y][x] like the list-of-lists maze """
+    def __init__(self, width, height, tiles=None):
+        self.width = width
+        self.height = height
+        self.tiles = bytearray(WALL.encode()) * (width * height) if tiles is None else tiles
+        self.rows = [GridRow(self.tiles, y * width, width) for y in range(height)]
+
+    def __getitem__(self, y):
+        return self.rows[y]
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def carve(self, x, y, width, height):
+        if width == 1:
+            # A column is one extended slice through every row
+            start = y * self.width + x
+            self.tiles[start:start + height * self.width:self.width] = EMPTY.encode() * height
+        else:
+            for row in range(y, y + height):
+                start = row * self.width + x
+                self.tiles[start:start + width] = EMPTY.encode() * width
+
+    def place_traps(self, probes, rng=random):
+        # One random 32-bit word per tile instead of one probe at a time. Each tile is hit when its word is
+        # below threshold: the chance that at least one of `probes` uniform probes of the interior lands on it.
+        interior = (self.width - 2) * (self.height - 2)
+        threshold = min(2 ** 32 - 1, round(2 ** 32 * (1 - (1 - 1 / interior) ** probes)))
+        words = rng.randbytes(4 * len(self.tiles))
+        # The words are big-endian, so most are settled by their first byte, compared for the whole grid
+        # at once; only the few whose first byte ties the threshold's are compared in full
+        top, rest = divmod(threshold, 1 << 24)
+        first = words[::4]
+        hits = bytearray(first.translate(bytes(v < top for v in range(256))))
+        i = first.find(top)
+        while i >= 0:
+            hits[i] = int.from_bytes(words[4 * i + 1:4 * i + 4], 'big') < rest
+            i = first.find(top, i + 1)
+        hits = int.from_bytes(hits, 'little')
+        empty = int.from_bytes(self.tiles.translate(EMPTY_FLAGS), 'little')
+        # Each hit byte is 0 or 1, so adding the code difference turns ' ' into '^' without carries
+        traps = hits & empty
+        self.tiles[:] = (int.from_bytes(self.tiles, 'little') + traps * (ord(TRAP) - ord(EMPTY))).to_bytes(len(self.tiles), 'little')
 
 def create_room(maze, x, y, room_width, room_height):
+    if isinstance(maze, GridMaze):
+        maze.carve(x, y, room_width, room_height)
+        return
     for i in range(x, x + room_width):
         for j in range(y, y + room_height):
             maze[j][i] = EMPTY
 
 def create_h_corridor(maze, x1, x2, y):
+    if isinstance(maze, GridMaze):
+        maze.carve(min(x1, x2), y, abs(x1 - x2) + 1, 1)
+        return
     for x in range(min(x1, x2), max(x1, x2) + 1):
         maze[y][x] = EMPTY
 
 def create_v_corridor(maze, y1, y2, x):
+    if isinstance(maze, GridMaze):
+        maze.carve(x, min(y1, y2), 1, abs(y1 - y2) + 1)
+        return
     for y in range(min(y1, y2), max(y1, y2) + 1):
         maze[y][x] = EMPTY
 
-def create_dungeon(width, height, max_rooms, room_min_size, room_max_size):
-    maze = [[WALL for _ in range(width)] for _ in range(height)]
-    rooms = []
+def room_center(room):
+    x, y, room_width, room_height = room
+    return x + room_width // 2, y + room_height // 2
+
+def create_corridor(maze, start, end, rng=random):
+    # L-shaped corridor between two points, bending at a random corner
+    (x1, y1), (x2, y2) = start, end
+    if rng.randint(0, 1) == 1:
+        create_h_corridor(maze, x1, x2, y1)
+        create_v_corridor(maze, y1, y2, x2)
+    else:
+        create_v_corridor(maze, y1, y2, x1)
+        create_h_corridor(maze, x1, x2, y2)
+
+def spanning_links(rooms, loops=0, rng=random):
+    # Minimum spanning tree over the room centres (Prim), plus `loops` random extra links
+    centers = [room_center(room) for room in rooms]
+
+    def distance(a, b):
+        return abs(centers[a][0] - centers[b][0]) + abs(centers[a][1] - centers[b][1])
+
+    links = []
+    remaining = set(range(1, len(rooms)))
+    best = {i: (distance(0, i), 0) for i in remaining}
+    while remaining:
+        room = min(remaining, key=lambda i: best[i])
+        remaining.remove(room)
+        links.append((best[room][1], room))
+        for i in remaining:
+            if distance(room, i) < best[i][0]:
+                best[i] = (distance(room, i), room)
+
+    linked = set(links)
+    extra = [(a, b) for a in range(len(rooms)) for b in range(a + 1, len(rooms)) if (a, b) not in linked and (b, a) not in linked]
+    return links + rng.sample(extra, min(loops, len(extra)))
+
+def create_dungeon(width, height, max_rooms, room_min_size, room_max_size, backend='list', connected=False, loops=0,
+                   rng=random, tiles_per_trap=TILES_PER_TRAP, rooms=None):
+    # backend='grid' builds a GridMaze, which is much faster for large maps.
+    # connected=True links the rooms with a spanning tree plus `loops` extra corridors
+    # instead of chaining each room to the one placed before it.
+    # rng is any random.Random; passing a seeded one makes the dungeon reproducible.
+    # rooms, if given, is a list the (x, y, width, height) of every room placed is added to.
+    if backend == 'grid':
+        maze = GridMaze(width, height)
+    else:
+        maze = [[WALL for _ in range(width)] for _ in range(height)]
+    if rooms is None:
+        rooms = []
 
     for _ in range(max_rooms):
-        room_width = random.randint(room_min_size, room_max_size)
-        room_height = random.randint(room_min_size, room_max_size)
-        x = random.randint(1, width - room_width - 1)
-        y = random.randint(1, height - room_height - 1)
+        room_width = rng.randint(room_min_size, room_max_size)
+        room_height = rng.randint(room_min_size, room_max_size)
+        x = rng.randint(1, width - room_width - 1)
+        y = rng.randint(1, height - room_height - 1)
 
         new_room = (x, y, room_width, room_height)
 
@@ -38,28 +165,25 @@ def create_dungeon(width, height, max_rooms, room_min_size, room_max_size):
 
         if not failed:
             create_room(maze, x, y, room_width, room_height)
-            if rooms:
-                prev_x, prev_y, prev_w, prev_h = rooms[-1]
-                prev_center_x = prev_x + prev_w // 2
-                prev_center_y = prev_y + prev_h // 2
-                new_center_x = x + room_width // 2
-                new_center_y = y + room_height // 2
-
-                if random.randint(0, 1) == 1:
-                    create_h_corridor(maze, prev_center_x, new_center_x, prev_center_y)
-                    create_v_corridor(maze, prev_center_y, new_center_y, new_center_x)
-                else:
-                    create_v_corridor(maze, prev_center_y, new_center_y, prev_center_x)
-                    create_h_corridor(maze, prev_center_x, new_center_x, new_center_y)
+            if rooms and not connected:
+                create_corridor(maze, room_center(rooms[-1]), room_center(new_room), rng)
 
             rooms.append(new_room)
 
-    for _ in range(width * height // 15):  # Adjust the number of traps accordingly
-        x, y = random.randint(1, width - 2), random.randint(1, height - 2)
-        if maze[y][x] == EMPTY:
-            maze[y][x] = TRAP
+    if connected:
+        for a, b in spanning_links(rooms, loops, rng):
+            create_corridor(maze, room_center(rooms[a]), room_center(rooms[b]), rng)
+
+    if isinstance(maze, GridMaze):
+        maze.place_traps(width * height // tiles_per_trap, rng)
+    else:
+        for _ in range(width * height // tiles_per_trap):
+            x, y = rng.randint(1, width - 2), rng.randint(1, height - 2)
+            if maze[y][x] == EMPTY:
+                maze[y][x] = TRAP
 
-    return maze, (rooms[0][0] + rooms[0][2] // 2, rooms[0][1] + rooms[0][3] // 2)
+    return maze, room_center(rooms[0])
 
-def create_maze(width, height):
-    return create_dungeon(width, height, max_rooms=15, room_min_size=3, room_max_size=7)
+def create_maze(width, height, backend='list', connected=False, loops=0, rng=random):
+    return create_dungeon(width, height, max_rooms=15, room_min_size=3, room_max_size=7,
+                          backend=backend, connected=connected, loops=loops, rng=rng)
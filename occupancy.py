@@ -0,0 +1,28 @@
+# Everything that can stand on a tile, one layer per kind of thing
+LAYERS = ('minotaur', 'enemy', 'bullet', 'ammo', 'torch')
+
+class Occupancy:
+    """ Per-tile index of the things on the map so lookups by (x, y) are O(1) """
+    def __init__(self):
+        self.layers = {layer: {} for layer in LAYERS}
+
+    def add(self, layer, pos, item=True):
+        self.layers[layer].setdefault(pos, []).append(item)
+
+    def remove(self, layer, pos, item=True):
+        items = self.layers[layer][pos]
+        items.remove(item)
+        if not items:
+            del self.layers[layer][pos]
+
+    def move(self, entity, old_pos):
+        new_pos = (entity.x, entity.y)
+        if new_pos != old_pos:
+            self.remove(entity.layer, old_pos, entity)
+            self.add(entity.layer, new_pos, entity)
+
+    def get(self, layer, pos):
+        return self.layers[layer].get(pos, ())
+
+    def positions(self, layer):
+        return self.layers[layer].keys()
@@ -0,0 +1,93 @@
+import array
+from collections import deque
+
+from maze import GridMaze, WALL
+
+# Neighbour order also decides ties, matching the x-before-y preference of the old greedy chase
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+UNREACHABLE = -1
+
+OPEN_FLAGS = bytes(code != ord(WALL) for code in range(256))  # Maps a tile byte to 1 unless it is a wall
+
+def open_tiles(maze, width, height):
+    # The outer ring is treated as wall so neighbour indices never wrap to another row
+    if isinstance(maze, GridMaze):
+        # One translate over the flat tiles, then the ring is cleared a row or column slice at a time
+        walkable = bytearray(bytes(maze.tiles).translate(OPEN_FLAGS))
+        walkable[:width] = walkable[-width:] = bytes(width)
+        walkable[::width] = walkable[width - 1::width] = bytes(height)
+        return walkable
+    return bytearray(0 < x < width - 1 and 0 < y < height - 1 and maze[y][x] != WALL
+                     for y in range(height) for x in range(width))
+
+def label_regions(maze, width, height):
+    """
+    Flood-fills the walkable tiles into connected regions in one pass. Returns a flat array of
+    region labels (UNREACHABLE for walls) and the size of each region.
+    """
+    walkable = open_tiles(maze, width, height)
+    labels = array.array('i', [UNREACHABLE]) * (width * height)
+    sizes = []
+    steps = (1, -1, width, -width)
+    for start in range(width * height):
+        if not walkable[start] or labels[start] != UNREACHABLE:
+            continue
+        region = len(sizes)
+        labels[start] = region
+        queue = deque([start])
+        size = 0
+        while queue:
+            i = queue.popleft()
+            size += 1
+            for step in steps:
+                j = i + step
+                if walkable[j] and labels[j] == UNREACHABLE:
+                    labels[j] = region
+                    queue.append(j)
+        sizes.append(size)
+    return labels, sizes
+
+class DistanceField:
+    """ Breadth-first walking distance from one target tile to every tile of the maze """
+    def __init__(self, maze, width, height):
+        self.width = width
+        self.height = height
+        self.open = open_tiles(maze, width, height)
+        self.distances = array.array('i', [UNREACHABLE]) * (width * height)
+        self.target = None
+
+    def update(self, x, y):
+        # Only rebuild when the target has changed tile; every chaser then shares the result
+        if (x, y) == self.target:
+            return False
+        self.target = (x, y)
+
+        width = self.width
+        distances = array.array('i', [UNREACHABLE]) * (width * self.height)
+        start = y * width + x
+        distances[start] = 0
+        queue = deque([start])
+        steps = (1, -1, width, -width)
+        while queue:
+            i = queue.popleft()
+            next_distance = distances[i] + 1
+            for step in steps:
+                j = i + step
+                if self.open[j] and distances[j] == UNREACHABLE:
+                    distances[j] = next_distance
+                    queue.append(j)
+        self.distances = distances
+        return True
+
+    def distance(self, x, y):
+        return self.distances[y * self.width + x]
+
+    def step(self, x, y):
+        # Neighbouring tile one step closer to the target, or None when the target can't be reached
+        here = self.distances[y * self.width + x]
+        if here <= 0:
+            return None
+        for dx, dy in DIRECTIONS:
+            if self.distances[(y + dy) * self.width + x + dx] == here - 1:
+                return x + dx, y + dy
+        return None
@@ -0,0 +1,151 @@
+import atexit
+import csv
+import json
+import time
+from collections import deque
+
+# Phases of a frame in the order they run; time between two laps goes to the second one
+PHASES = ('events', 'input', 'patrol', 'chase', 'bullets', 'collisions', 'draw', 'flip', 'idle')
+WINDOW = 120  # Frames the on-screen averages and percentiles are taken over
+REFRESH = 0.5  # Seconds between updates of the on-screen summary
+
+_profilers = {}
+
+def open_profiler(trace_path=None):
+    """ One profiler per trace file for the whole process, so restarting a game keeps the trace going """
+    if trace_path not in _profilers:
+        _profilers[trace_path] = FrameProfiler(trace_path)
+        atexit.register(_profilers[trace_path].close)
+    return _profilers[trace_path]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class CsvTrace:
+    """ One row per frame: when it started and the milliseconds spent in each phase """
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(('frame', 'start_ms') + PHASES + ('total',))
+
+    def write(self, frame, start, laps):
+        totals = dict.fromkeys(PHASES, 0.0)
+        for phase, begin, end in laps:
+            totals[phase] += (end - begin) * 1000
+        self.writer.writerow([frame, f"{start * 1000:.3f}"] + [f"{totals[phase]:.3f}" for phase in PHASES]
+                             + [f"{sum(totals.values()):.3f}"])
+
+    def close(self):
+        self.file.close()
+
+class ChromeTrace:
+    """ Complete ("X") events in the Chrome trace JSON format, viewable in chrome://tracing or Perfetto """
+    def __init__(self, path):
+        self.file = open(path, 'w')
+        self.file.write('[\n')
+        self.first = True
+
+    def event(self, name, begin, end, args=None):
+        event = {"name": name, "ph": "X", "pid": 1, "tid": 1, "ts": round(begin * 1e6, 1), "dur": round((end - begin) * 1e6, 1)}
+        if args:
+            event["args"] = args
+        self.file.write(('' if self.first else ',\n') + json.dumps(event))
+        self.first = False
+
+    def write(self, frame, start, laps):
+        if laps:
+            self.event('frame', start, laps[-1][2], {"frame": frame})
+        for phase, begin, end in laps:
+            self.event(phase, begin, end)
+
+    def close(self):
+        self.file.write('\n]\n')
+        self.file.close()
+
+class FrameProfiler:
+    """
+    Splits each frame into PHASES with laps on one clock. Off by default: nothing is timed until the
+    overlay is shown or a trace file is given, and callers skip their laps while it is off.
+    """
+    def __init__(self, trace_path=None, clock=time.perf_counter):
+        self.clock = clock
+        self.trace = None
+        if trace_path:
+            self.trace = CsvTrace(trace_path) if trace_path.endswith('.csv') else ChromeTrace(trace_path)
+        self.overlay = False
+        self.frame = 0
+        self.start = self.last = None
+        self.laps = []
+        self.history = {phase: deque(maxlen=WINDOW) for phase in PHASES}
+        self.frame_times = deque(maxlen=WINDOW)
+        self.lines = []
+        self.refreshed = 0
+
+    @property
+    def enabled(self):
+        return self.overlay or self.trace is not None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.lines = []
+        self.discard_frame()  # The toggle happened half way through timing it
+
+    def discard_frame(self):
+        # Drops the frame being timed, e.g. one left open when the game loop gave way to a menu
+        self.start = self.last = None
+        self.laps = []
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        now = self.clock()
+        if self.start is not None:
+            self.end_frame(now)
+        self.start = self.last = now
+
+    def lap(self, phase):
+        # Time since the previous lap goes to phase; laps before start_frame are dropped
+        if self.last is None:
+            return
+        now = self.clock()
+        self.laps.append((phase, self.last, now))
+        self.last = now
+
+    def end_frame(self, now):
+        totals = dict.fromkeys(PHASES, 0.0)
+        for phase, begin, end in self.laps:
+            totals[phase] += (end - begin) * 1000
+        for phase, ms in totals.items():
+            self.history[phase].append(ms)
+        self.frame_times.append((now - self.start) * 1000)
+        if self.trace:
+            self.trace.write(self.frame, self.start, self.laps)
+        self.frame += 1
+        self.laps = []
+
+    def summary(self):
+        # Overlay text, rebuilt every REFRESH seconds so the lines don't change (and repaint) every frame
+        if not self.overlay or not self.frame_times:
+            return []
+        now = self.clock()
+        if self.lines and now - self.refreshed < REFRESH:
+            return self.lines
+        self.refreshed = now
+
+        # FPS at the median, 95th and 99th percentile frame times, i.e. how fast the slow frames are
+        frame_times = list(self.frame_times)
+        average = sum(frame_times) / len(frame_times)
+        lines = [f"Frame {average:.2f} ms  FPS {1000 / average:.0f}  "
+                 f"p50 {1000 / percentile(frame_times, 0.5):.0f}  "
+                 f"p95 {1000 / percentile(frame_times, 0.95):.0f}  p99 {1000 / percentile(frame_times, 0.99):.0f}"]
+        for phase in PHASES:
+            history = self.history[phase]
+            lines.append(f"{phase:<11}{sum(history) / len(history):7.2f} ms  max {max(history):6.2f}")
+        self.lines = lines
+        return lines
+
+    def close(self):
+        if self.trace:
+            self.trace.close()
+            self.trace = None
@@ -0,0 +1,67 @@
+from array import array
+
+MAX_PROJECTILES = 512  # Bullets that can be in flight at once; shots beyond this are not fired
+
+class ProjectilePool:
+    """
+    Bullets in flight as parallel arrays of fixed size. Spent slots go back on a free list and are
+    handed out again, so firing and moving bullets never allocates.
+    """
+    def __init__(self, capacity=MAX_PROJECTILES):
+        self.capacity = capacity
+        self.x = array('i', bytes(4 * capacity))
+        self.y = array('i', bytes(4 * capacity))
+        self.dx = array('b', bytes(capacity))
+        self.dy = array('b', bytes(capacity))
+        self.live = array('i', bytes(4 * capacity))  # Slots in flight, oldest first, in the first count entries
+        self.count = 0
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.free[:] = range(self.capacity - 1, -1, -1)
+
+    def spawn(self, x, y, dx, dy):
+        # Slot of the new bullet, or None when the pool is full
+        if not self.free:
+            return None
+        slot = self.free.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.live[self.count] = slot
+        self.count += 1
+        return slot
+
+    def advance(self, walkable, width, occupancy, hit):
+        """
+        Moves every live bullet one tile, oldest first. walkable is a flat row-major mask with a closed
+        outer ring, so one lookup both bounds-checks and wall-checks. A bullet entering a tile with a
+        minotaur or enemy calls hit(pos), which returns True when the bullet is stopped.
+        """
+        xs, ys, dxs, dys, live = self.x, self.y, self.dx, self.dy, self.live
+        minotaurs = occupancy.positions('minotaur')
+        enemies = occupancy.positions('enemy')
+        kept = 0
+        for i in range(self.count):
+            slot = live[i]
+            x = xs[slot]
+            y = ys[slot]
+            occupancy.remove('bullet', (x, y), slot)
+            x += dxs[slot]
+            y += dys[slot]
+            pos = (x, y)
+            if not walkable[y * width + x] or ((pos in minotaurs or pos in enemies) and hit(pos)):
+                self.free.append(slot)
+                continue
+            xs[slot] = x
+            ys[slot] = y
+            occupancy.add('bullet', pos, slot)
+            # Survivors are packed to the front in the same order
+            live[kept] = slot
+            kept += 1
+        self.count = kept
@@ -0,0 +1,277 @@
+from collections import OrderedDict
+
+import pygame
+
+TILE_SIZE = 20
+BACKGROUND = (0, 0, 0)
+FOG = (0, 0, 0)
+CLEAR = (255, 0, 255)  # Colour key for the holes punched in the fog mask
+CHUNK_TILES = 16  # The static and fog layers are painted in squares this many tiles a side, as they come into view
+MAX_CHUNKS = 96  # Squares kept per layer; the least recently drawn are dropped and painted again when next seen
+
+# Tiles baked into the static layer; they are drawn over anything standing on them
+STATIC_GLYPHS = {'#': 'wall', '^': 'trap'}
+
+# Dynamic layers from lowest to highest priority when several share a tile. Decals live in the static
+# layer: the layers in UNDER_DECALS are covered by blood or a body on their tile, the rest hide it
+DYNAMIC_LAYERS = ('torch', 'ammo', 'bullet', 'enemy')
+UNDER_DECALS = ('torch',)
+
+class ChunkedLayer:
+    """
+    A map-sized layer kept as squares of CHUNK_TILES tiles, each painted by paint(surface, x0, y0, x1, y1)
+    the first time it is drawn. Only squares near the player ever exist, so a level of any size is
+    ready at once and its layers take bounded memory.
+    """
+    def __init__(self, screen, width, height, paint, colorkey=None, limit=MAX_CHUNKS):
+        self.screen = screen  # Squares are made in its pixel format so blitting them needs no conversion
+        self.width = width
+        self.height = height
+        self.paint = paint
+        self.colorkey = colorkey
+        self.limit = limit
+        self.chunks = OrderedDict()  # (cx, cy) -> surface, least recently drawn first
+
+    def chunk(self, cx, cy):
+        surface = self.chunks.get((cx, cy))
+        if surface is not None:
+            self.chunks.move_to_end((cx, cy))
+            return surface
+        x0, y0 = cx * CHUNK_TILES, cy * CHUNK_TILES
+        x1, y1 = min(self.width, x0 + CHUNK_TILES), min(self.height, y0 + CHUNK_TILES)
+        surface = pygame.Surface(((x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE), 0, self.screen)
+        if self.colorkey is not None:
+            surface.set_colorkey(self.colorkey)
+        self.paint(surface, x0, y0, x1, y1)
+        self.chunks[(cx, cy)] = surface
+        if len(self.chunks) > self.limit:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def tile(self, x, y, build=True):
+        # The square holding tile (x, y) and the tile's rect within it. Without build, a square that
+        # isn't painted yet comes back as None: it will be painted from the current state when it is
+        chunk = (x // CHUNK_TILES, y // CHUNK_TILES)
+        surface = self.chunk(*chunk) if build else self.chunks.get(chunk)
+        return surface, pygame.Rect((x % CHUNK_TILES) * TILE_SIZE, (y % CHUNK_TILES) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+    def blit(self, screen, window):
+        # Copies window, a rect in map pixels, to the top left corner of screen
+        size = CHUNK_TILES * TILE_SIZE
+        for cy in range(window.top // size, (window.bottom - 1) // size + 1):
+            for cx in range(window.left // size, (window.right - 1) // size + 1):
+                area = window.clip(pygame.Rect(cx * size, cy * size, size, size))
+                screen.blit(self.chunk(cx, cy), area.move(-window.x, -window.y), area.move(-cx * size, -cy * size))
+
+class Renderer:
+    """ Draws the game view, pushing only the tiles and HUD lines that changed since the last frame """
+    def __init__(self, screen, glyphs, incremental=True):
+        self.screen = screen
+        self.glyphs = glyphs
+        self.incremental = incremental
+        self.profiler = None  # A FrameProfiler to split drawing from presenting the frame
+        self.level = None
+        self.static = None
+        self.fog = None
+        self.invalidate()
+
+    def invalidate(self):
+        # Forces the next frame to be drawn from scratch, e.g. after a menu painted over the screen
+        self.view = None
+        self.cells = {}
+        self.fogged = None
+        self.hud = []
+        self.hud_rect = None
+        self.overlay = []
+        self.overlay_rect = None
+
+    def set_level(self, level):
+        # level is the Simulation (or a Level) whose maze, decals and visibility the layers show. Nothing
+        # is painted here, so changing level costs the same whatever its size
+        self.level = level
+        self.static = ChunkedLayer(self.screen, level.width, level.height, self.paint_static)
+        self.fog = ChunkedLayer(self.screen, level.width, level.height, self.paint_fog, CLEAR)
+        self.invalidate()
+
+    def paint_static(self, surface, x0, y0, x1, y1):
+        # Walls and traps never change within a level. Blood and bodies are stamped into the same
+        # layer as they appear, see sync_decals
+        maze, decals = self.level.maze, self.level.decals
+        surface.fill(BACKGROUND)
+        blits = []
+        for y in range(y0, y1):
+            row = maze[y]
+            for x in range(x0, x1):
+                glyph = STATIC_GLYPHS.get(row[x]) or decals.get(x, y)
+                if glyph:
+                    blits.append((self.glyphs.tile(glyph), ((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE)))
+        surface.blits(blits, False)
+
+    def paint_fog(self, surface, x0, y0, x1, y1):
+        visibility = self.level.visibility
+        surface.fill(FOG)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if visibility.is_visible(x, y):
+                    surface.fill(CLEAR, ((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+    def draw(self, sim, fog_of_war, overlay=()):
+        # overlay is more (surface, pos) lines drawn over everything, repainted apart from the HUD
+        screen_width, screen_height = self.screen.get_size()
+
+        # Determine the visible region of the maze based on player position
+        view_x_start = max(0, sim.player.x - screen_width // (2 * TILE_SIZE))
+        view_x_end = min(sim.width, sim.player.x + screen_width // (2 * TILE_SIZE))
+        view_y_start = max(0, sim.player.y - screen_height // (2 * TILE_SIZE))
+        view_y_end = min(sim.height, sim.player.y + screen_height // (2 * TILE_SIZE))
+        view = (view_x_start, view_y_start, view_x_end, view_y_end)
+        window = pygame.Rect(view_x_start * TILE_SIZE, view_y_start * TILE_SIZE,
+                             (view_x_end - view_x_start) * TILE_SIZE, (view_y_end - view_y_start) * TILE_SIZE)
+
+        cells = self.dynamic_cells(sim, view)
+        decal_cells = self.sync_decals(sim.decals, view)
+        fog_cells = self.sync_fog(sim.visibility, view)
+        fogged = fog_of_war
+
+        hud = self.hud_lines(sim, screen_width, screen_height)
+        hud_rect = self.bounds([surface.get_rect(topleft=pos) for surface, pos in hud])
+        overlay = list(overlay)
+        overlay_rect = self.bounds([surface.get_rect(topleft=pos) for surface, pos in overlay])
+        profiler = self.profiler
+
+        if not self.incremental or view != self.view or fogged != self.fogged:
+            # The camera scrolled or the fog was toggled, so every tile on screen changed
+            self.compose(window, cells, fogged, hud + overlay)
+            if profiler:
+                profiler.lap('draw')
+            pygame.display.flip()
+        else:
+            dirty = {cell for cell in cells.keys() | self.cells.keys() if cells.get(cell) != self.cells.get(cell)}
+            dirty.update(decal_cells)
+            if fogged:
+                dirty.update(fog_cells)
+
+            rects = []
+            for cell in dirty:
+                rect = self.cell_rect(cell)
+                x, y = cell[0] + view_x_start, cell[1] + view_y_start
+                self.screen.fill(BACKGROUND, rect)
+                glyph = cells.get(cell)
+                if glyph is None:
+                    surface, area = self.static.tile(x, y)
+                    self.screen.blit(surface, rect, area)
+                else:
+                    self.screen.blit(self.glyphs.tile(glyph), rect)
+                if fogged:
+                    surface, area = self.fog.tile(x, y)
+                    self.screen.blit(surface, rect, area)
+                rects.append(rect)
+
+            # The HUD and overlay are drawn over the map, so repaint each when it changes or a tile under it did
+            for lines, old_lines, rect, old_rect in ((hud, self.hud, hud_rect, self.hud_rect),
+                                                     (overlay, self.overlay, overlay_rect, self.overlay_rect)):
+                area = self.bounds([r for r in (rect, old_rect) if r])
+                if area and (lines != old_lines or area.collidelist(rects) != -1):
+                    self.screen.set_clip(area)
+                    self.compose(window, cells, fogged, hud + overlay)
+                    self.screen.set_clip(None)
+                    rects.append(area)
+
+            if profiler:
+                profiler.lap('draw')
+            if rects:
+                pygame.display.update(rects)
+
+        self.view = view
+        self.cells = cells
+        self.fogged = fogged
+        self.hud = hud
+        self.hud_rect = hud_rect
+        self.overlay = overlay
+        self.overlay_rect = overlay_rect
+        if profiler:
+            profiler.lap('flip')
+
+    def compose(self, window, cells, fogged, hud):
+        self.screen.fill(BACKGROUND)
+        self.static.blit(self.screen, window)
+        for cell, glyph in cells.items():
+            rect = self.cell_rect(cell)
+            self.screen.fill(BACKGROUND, rect)  # Dynamic cells never hold walls or traps, only maybe a decal
+            self.screen.blit(self.glyphs.tile(glyph), rect)
+        if fogged:
+            self.fog.blit(self.screen, window)
+        for surface, pos in hud:
+            self.screen.blit(surface, pos)
+
+    def dynamic_cells(self, sim, view):
+        # Glyph shown in each screen cell over the static layer, later layers winning ties
+        view_x_start, view_y_start, view_x_end, view_y_end = view
+        placed = []
+        for layer in DYNAMIC_LAYERS:
+            if layer in UNDER_DECALS:
+                placed.extend((pos, layer) for pos in sim.occupancy.positions(layer) if not sim.decals.get(*pos))
+            else:
+                placed.extend((pos, layer) for pos in sim.occupancy.positions(layer))
+        placed.append((sim.exit_pos, 'exit'))
+        placed.append((sim.key_pos, 'key'))
+        placed.extend(((minotaur.x, minotaur.y), 'minotaur') for minotaur in sim.minotaurs)
+        placed.append(((sim.player.x, sim.player.y), 'player'))
+
+        cells = {}
+        for pos, glyph in placed:
+            if pos is None:
+                continue
+            x, y = pos
+            if view_x_start <= x < view_x_end and view_y_start <= y < view_y_end and sim.maze[y][x] not in STATIC_GLYPHS:
+                cells[(x - view_x_start, y - view_y_start)] = glyph
+        return cells
+
+    def sync_decals(self, decals, view):
+        # Stamp the decals added or cleared since the last frame into the static layer and return the
+        # screen cells among them. Drawing then costs the same however many there are
+        view_x_start, view_y_start, view_x_end, view_y_end = view
+        cells = []
+        for x, y in decals.drain():
+            surface, rect = self.static.tile(x, y, build=False)
+            if surface is not None:
+                surface.fill(BACKGROUND, rect)
+                kind = decals.get(x, y)
+                if kind:
+                    surface.blit(self.glyphs.tile(kind), rect)
+            if view_x_start <= x < view_x_end and view_y_start <= y < view_y_end:
+                cells.append((x - view_x_start, y - view_y_start))
+        return cells
+
+    def sync_fog(self, visibility, view):
+        # Repaint the fog tiles whose visibility changed and return the screen cells among them
+        view_x_start, view_y_start, view_x_end, view_y_end = view
+        cells = []
+        for x, y in visibility.drain():
+            surface, rect = self.fog.tile(x, y, build=False)
+            if surface is not None:
+                surface.fill(CLEAR if visibility.is_visible(x, y) else FOG, rect)
+            if view_x_start <= x < view_x_end and view_y_start <= y < view_y_end:
+                cells.append((x - view_x_start, y - view_y_start))
+        return cells
+
+    def hud_lines(self, sim, screen_width, screen_height):
+        hud = [
+            (self.glyphs.label('hp', f"HP: {sim.hit_points}", (255, 0, 0)), (10, screen_height - 30)),
+            (self.glyphs.label('bullets', f"Bullets: {sim.bullets}", (0, 255, 0)), (200, screen_height - 30)),
+            (self.glyphs.label('torches', f"Torches: {sim.torches}", (255, 165, 0)), (400, screen_height - 30)),
+        ]
+        for i, minotaur in enumerate(sim.minotaurs):
+            minotaur_hp_text = self.glyphs.label(f'minotaur_hp_{i}', f"Minotaur HP: {minotaur.hp}", (255, 0, 0))
+            hud.append((minotaur_hp_text, (10, screen_height - 60 - (i * 30))))
+
+        if sim.minotaurs_spring_to_life_message_displayed:
+            spring_message = self.glyphs.text("The Minotaurs spring to life! Run!", (255, 255, 255))
+            hud.append((spring_message, (screen_width - spring_message.get_width() - 10, screen_height - 30)))
+        return hud
+
+    def cell_rect(self, cell):
+        return pygame.Rect(cell[0] * TILE_SIZE, cell[1] * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+    def bounds(self, rects):
+        return rects[0].unionall(rects[1:]) if rects else None
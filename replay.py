@@ -0,0 +1,106 @@
+"""
+Records the seed, levels and per-tick input of a game so it can be played back exactly, either in a
+window at the recorded tick rate or headless as fast as it will go (a repeatable profiling workload).
+
+REPLAY_DIR=replays python main.py                 # save a replay of every game played
+python replay.py replays/20240526-023531.replay   # headless
+python replay.py replays/20240526-023531.replay --profile
+python replay.py replays/20240526-023531.replay --watch
+"""
+import argparse
+import json
+import os
+import time
+import zlib
+
+from simulation import Simulation, TICK_RATE
+
+MAGIC = b'MINOTAUR-REPLAY 1\n'
+
+class Recording:
+    """ A game's seed, LEVELS and the action bitmask of every tick, one byte each, zlib-compressed on disk """
+    def __init__(self, seed, levels, tick_rate=TICK_RATE, start_tick=0, actions=None):
+        self.seed = seed
+        self.levels = levels
+        self.tick_rate = tick_rate
+        self.start_tick = start_tick  # Scheduler tick the game started on, so replayed times match exactly
+        self.actions = actions if actions is not None else bytearray()
+
+    def __len__(self):
+        return len(self.actions)
+
+    def record(self, action):
+        self.actions.append(action)
+
+    def now(self, i):
+        # Simulation time of the i-th recorded tick, computed the same way as FixedTimestep.now
+        return (self.start_tick + i + 1) * (1000 / self.tick_rate)
+
+    def save(self, path):
+        header = {"seed": self.seed, "levels": self.levels, "tick_rate": self.tick_rate,
+                  "start_tick": self.start_tick, "ticks": len(self.actions)}
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(json.dumps(header).encode('utf-8') + b'\n')
+            file.write(zlib.compress(bytes(self.actions), 9))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            if file.readline() != MAGIC:
+                raise ValueError(f"{path} is not a replay file")
+            header = json.loads(file.readline())
+            actions = bytearray(zlib.decompress(file.read()))
+        return cls(header["seed"], header["levels"], header["tick_rate"], header["start_tick"], actions)
+
+def play(recording):
+    """ Runs every recorded tick without a display and returns the simulation as it ended """
+    sim = Simulation(recording.levels, seed=recording.seed)
+    sim.start(recording.now(-1))
+    for i, action in enumerate(recording.actions):
+        sim.step(action, recording.now(i))
+        sim.events.clear()
+        if sim.outcome is not None:
+            break
+    return sim
+
+def watch(recording):
+    import pygame
+    from game import Game, SCREEN_WIDTH, SCREEN_HEIGHT
+
+    pygame.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Escape the Minotaur! (replay)")
+    Game(screen, replay=recording).run()
+    pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded game")
+    parser.add_argument("path")
+    parser.add_argument("--watch", action="store_true", help="play it in a window in real time")
+    parser.add_argument("--profile", action="store_true", help="print where the headless run spends its time")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    if args.watch:
+        watch(recording)
+        return
+
+    start = time.perf_counter()
+    if args.profile:
+        import cProfile
+        import pstats
+        profile = cProfile.Profile()
+        sim = profile.runcall(play, recording)
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(25)
+    else:
+        sim = play(recording)
+    elapsed = time.perf_counter() - start
+    print(f"{len(recording)} ticks in {elapsed:.2f}s ({len(recording) / elapsed:.0f} ticks/s), seed {recording.seed}")
+    print(f"Level {sim.level + 1}, kills {sim.enemies_killed}, HP {sim.hit_points}: {sim.outcome or 'still playing'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import time
+
+class FixedTimestep:
+    """
+    Turns real time from one monotonic clock into whole logic ticks at a fixed rate, so the game
+    runs at the same speed however fast or slow frames are drawn.
+    """
+    def __init__(self, tick_rate, max_ticks_per_frame=10, clock=time.perf_counter):
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+        self.tick = 0
+        self.accumulator = 0
+        self.previous = None
+
+    @property
+    def now(self):
+        # Simulation time in milliseconds
+        return self.tick * self.tick_ms
+
+    @property
+    def alpha(self):
+        # How far real time is into the next tick, from 0 to 1, for interpolating between ticks
+        return self.accumulator / self.tick_ms
+
+    def reset(self):
+        # Don't count time spent outside the game loop, e.g. on a menu
+        self.previous = None
+        self.accumulator = 0
+
+    def ticks(self):
+        # Yields the simulation time of every tick that has come due since the last call
+        current = self.clock()
+        if self.previous is not None:
+            self.accumulator += (current - self.previous) * 1000
+        self.previous = current
+
+        due = int(self.accumulator // self.tick_ms)
+        if due > self.max_ticks_per_frame:
+            # Too far behind to catch up (a stall or breakpoint); drop the backlog instead of spiralling
+            due = self.max_ticks_per_frame
+            self.accumulator = 0
+        else:
+            self.accumulator -= due * self.tick_ms
+
+        for _ in range(due):
+            self.tick += 1
+            yield self.now
@@ -1,16 +1,14 @@
-import json
+from scorestore import ScoreStore, SCORES_FILE
 
-def display_scores(scores_file='scores.json'):
-    try:
-        with open(scores_file, 'r') as file:
-            scores = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
+def display_scores(scores_file=SCORES_FILE):
+    scores = ScoreStore(scores_file)
+    if not scores.count:
         print("No scores available.")
         return
 
     print(f"{'Date':<20}{'Time (s)':<10}{'Enemies Killed':<15}{'Score':<10}")
     print("-" * 55)
-    for entry in scores:
+    for entry in scores.entries():
         print(f"{entry['datetime']:<20}{entry['time']:<10.2f}{entry['enemies_killed']:<15}{entry['score']:<10.2f}")
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+import atexit
+import heapq
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+SCORES_FILE = 'scores.jsonl'
+LEGACY_SCORES_FILE = 'scores.json'  # Whole-file JSON list written by older versions
+TOP_SCORES = 10
+WRITE_QUEUE_SIZE = 64  # Scores waiting for the disk before save() blocks
+
+_stores = {}
+
+def open_scores(path=SCORES_FILE, legacy_path=LEGACY_SCORES_FILE):
+    """ One shared store per file, so every screen sees new scores without re-reading the file """
+    path = os.path.abspath(path)
+    if path not in _stores:
+        _stores[path] = ScoreStore(path, legacy_path, background=True)
+        atexit.register(_stores[path].flush)  # Also covers exits that skip Game.run's flush
+    return _stores[path]
+
+def score_entry(elapsed_time, enemies_killed, score):
+    return {
+        "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "time": elapsed_time,
+        "enemies_killed": enemies_killed,
+        "score": score
+    }
+
+class ScoreStore:
+    """
+    Scores kept as one JSON object per line. Saving appends a single line, and the leaderboard is a
+    heap of the best TOP_SCORES entries, so neither grows with the number of games played.
+    """
+    def __init__(self, path=SCORES_FILE, legacy_path=LEGACY_SCORES_FILE, top_n=TOP_SCORES, background=False):
+        self.path = path
+        self.top_n = top_n
+        self.count = 0
+        self.heap = []  # (score, -sequence, entry); ties go to the older entry, as a stable sort would
+        if not os.path.exists(path) and legacy_path and os.path.exists(legacy_path):
+            self.migrate(legacy_path)
+        for entry in self.entries():
+            self.index(entry)
+        self.writer = ScoreWriter(self) if background else None
+
+    def migrate(self, legacy_path):
+        # One-time copy of the old JSON list; written aside and renamed so a crash leaves no half file
+        try:
+            with open(legacy_path, 'r') as file:
+                scores = json.load(file)
+        except json.JSONDecodeError:
+            return
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as file:
+            for entry in scores:
+                file.write(json.dumps(entry) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def entries(self):
+        # Every saved entry in the order played; a line cut short by a crash is skipped
+        try:
+            with open(self.path, 'r') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def index(self, entry):
+        item = (entry['score'], -self.count, entry)
+        self.count += 1
+        if len(self.heap) < self.top_n:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def append(self, entry):
+        # The leaderboard sees the entry at once; with a writer the disk catches up in the background
+        self.index(entry)
+        if self.writer:
+            self.writer.queue.put(entry)
+        else:
+            self.write(entry)
+
+    def write(self, entry):
+        line = json.dumps(entry) + '\n'
+        with open(self.path, 'a+b') as file:
+            # Start on a fresh line if the last write was interrupted part way through
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    line = '\n' + line
+            file.write(line.encode('utf-8'))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def save(self, elapsed_time, enemies_killed, score):
+        entry = score_entry(elapsed_time, enemies_killed, score)
+        self.append(entry)
+        return entry
+
+    def flush(self):
+        # Wait until every saved score is on disk
+        if self.writer:
+            self.writer.queue.join()
+
+    def top(self, n=None):
+        best = [item[2] for item in sorted(self.heap, key=lambda item: item[:2], reverse=True)]
+        return best[:n]
+
+class ScoreWriter(threading.Thread):
+    """ Writes queued scores to the store's file so the game loop never waits on the disk """
+    def __init__(self, store):
+        super().__init__(name='score-writer', daemon=True)
+        self.store = store
+        self.queue = queue.Queue(WRITE_QUEUE_SIZE)
+        self.start()
+
+    def run(self):
+        while True:
+            entry = self.queue.get()
+            try:
+                self.store.write(entry)
+            except OSError as error:
+                print(f"Could not save score: {error}")
+            finally:
+                self.queue.task_done()
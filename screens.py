@@ -0,0 +1,39 @@
+import pygame
+
+QUIT = 'quit'  # What run_modal returns when the window is closed
+IDLE_REFRESH = 500  # Milliseconds a modal screen sleeps before checking whether what it shows has changed
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+def run_modal(screen, paint, keys, version=None, refresh=IDLE_REFRESH):
+    """
+    Shows a menu-style screen until one of keys is pressed and returns what that key maps to, or QUIT
+    when the window is closed. paint() draws the whole screen. It runs once, then again only when
+    version() changes or the window is uncovered; in between the loop sleeps in pygame.event.wait,
+    so a screen left idle uses next to no CPU.
+    """
+    shown = object()  # Never equal to a version, so the first pass paints
+    while True:
+        current = version() if version else None
+        if current != shown:
+            paint()
+            pygame.display.flip()
+            shown = current
+
+        event = pygame.event.wait(refresh)
+        if event.type == pygame.QUIT:
+            return QUIT
+        if event.type == pygame.KEYDOWN and event.key in keys:
+            return keys[event.key]
+        if event.type in EXPOSE_EVENTS:
+            shown = object()
+
+def centered(screen, surface, y):
+    return screen.get_width() // 2 - surface.get_width() // 2, y
+
+def score_lines(glyphs, top_scores, x, y, spacing):
+    # Leaderboard rows, each cached by the glyph atlas until its text changes
+    lines = []
+    for i, score in enumerate(top_scores):
+        score_text = f"{i+1}. {score['datetime']} - Time: {score['time']:.2f}s, Enemies: {score['enemies_killed']}, Score: {score['score']:.2f}"
+        lines.append((glyphs.label(f'score_{i}', score_text, (255, 255, 255)), (x, y + i * spacing)))
+    return lines
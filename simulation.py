@@ -0,0 +1,279 @@
+import random
+
+from entities import PatrollingEnemy, patrol_all
+from level import LevelPipeline
+from projectiles import ProjectilePool
+from freecells import chebyshev
+
+# Constants
+# A level can add "backend": "grid" to be generated as a compact GridMaze (see maze.py),
+# "connected": False for the old chained rooms, "loops": n for extra corridors, or "horde": n
+# to start with n patrolling enemies instead of a handful. "pack": path loads a level baked
+# with levelpack.py in place of "width", "height" and the generator options
+LEVELS = [
+    {"width": 40, "height": 30, "torches": 4, "minotaur_hp": 8, "minotaurs": 1, "minotaur_speed": 250, "music": "level1_music.mp3"},
+    {"width": 50, "height": 40, "torches": 5, "minotaur_hp": 8, "minotaurs": 2, "minotaur_speed": 250, "music": "level2_music.mp3"},
+    {"width": 60, "height": 50, "torches": 6, "minotaur_hp": 15, "minotaurs": 1, "minotaur_speed": 200, "music": "level3_music.mp3"}
+]
+TICK_RATE = 60  # Logic ticks per second; bullets move one tile per tick
+MOVE_DELAY = 200  # Milliseconds between moves
+ENEMY_MOVE_DELAY = 500  # Milliseconds between enemy moves
+ENEMY_SPAWN_DELAY = 10000  # Milliseconds between patrolling enemy spawns
+MINOTAUR_PAUSE = 2000  # Milliseconds the minotaur stops after hitting the player
+MESSAGE_DURATION = 3000  # Milliseconds the "minotaurs spring to life" message stays up
+TORCH_RADIUS = 3  # Radius of visibility around torches
+PLAYER_RADIUS = 4  # Radius of visibility around player
+LINE_OF_SIGHT = True  # Walls block the light from the player and torches
+MAX_PATROLLING_ENEMIES = 8  # Maximum number of patrolling enemies, unless a horde level starts with more
+
+# Input for one tick is a bitmask of these actions
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+SHOOT = 16
+TORCH = 32
+
+MOVES = ((UP, (0, -1)), (DOWN, (0, 1)), (LEFT, (-1, 0)), (RIGHT, (1, 0)))
+
+class Simulation:
+    """
+    All of the game rules, advanced one tick at a time from an input bitmask and a clock in
+    milliseconds. Nothing here touches pygame: sounds and screens are left to the front end,
+    which reads the names queued in events after each step.
+    """
+    def __init__(self, levels=LEVELS, pregenerate=False, seed=None):
+        # With pregenerate the next level is built on a worker thread while this one is played.
+        # Every random draw comes from the seed, so the same seed and inputs replay the same game.
+        self.levels = levels
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.pipeline = LevelPipeline(levels, seed=self.seed, line_of_sight=LINE_OF_SIGHT, player_radius=PLAYER_RADIUS)
+        self.pregenerate = pregenerate
+        self.projectiles = ProjectilePool()
+        self.hit_points = 3
+        self.last_move_time = 0
+        self.last_enemy_move_time = 0
+        self.last_minotaur_move_time = 0
+        self.last_minotaur_hit_time = -MINOTAUR_PAUSE
+        self.start_time = 0
+        self.enemies_killed = 0
+        self.torch_positions = []
+        self.enemy_spawn_time = 0  # Track the time for spawning enemies
+        self.minotaurs_spring_to_life_message_displayed = False
+        self.minotaurs_message_start_time = 0  # Track the time when the message is displayed
+        self.events = []
+        self.profiler = None  # A FrameProfiler the front end sets to time the phases of each step
+        self.result = None  # (elapsed seconds, enemies killed, score) of the last finished run or level
+        self.outcome = None  # Game over message once the run has ended
+        self.level = 0
+        self.setup_level()
+
+    def setup_level(self):
+        # Swap in the level built in the background if there is one, then start building the next
+        level = self.pipeline.take(self.level)
+        if self.pregenerate:
+            self.pipeline.prepare(self.level + 1)
+
+        self.width = level.width
+        self.height = level.height
+        self.torches = level.torches
+        self.minotaur_speed = level.minotaur_speed
+        self.music = level.music
+        self.maze = level.maze
+        self.player_start = level.player_start
+        self.free_cells = level.free_cells
+        self.player = level.player
+        self.last_move_direction = (0, -1)  # Initial direction (up)
+        self.distance_field = level.distance_field
+        self.minotaurs = level.minotaurs
+        self.key_pos = level.key_pos
+        self.exit_pos = level.exit_pos
+        self.has_key = False
+        self.bullets = 6
+        self.ammo_positions = level.ammo_positions
+        self.projectiles.clear()
+        self.decals = level.decals  # Blood and bodies, capped so kills don't slow the game down
+        self.patrolling_enemies = level.patrolling_enemies
+        self.max_patrolling_enemies = max(MAX_PATROLLING_ENEMIES, len(self.patrolling_enemies))
+
+        # Index everything on the map by tile so draw and collisions don't scan lists
+        self.occupancy = level.occupancy
+
+        # Light sources are only recomputed when they move or a torch is dropped. Torches stay where
+        # they were dropped, so those off the edge of a smaller level are left out of it
+        self.visibility = level.visibility
+        for i, (tx, ty) in enumerate(self.torch_positions):
+            if tx < self.width and ty < self.height:
+                self.occupancy.add('torch', (tx, ty))
+                self.visibility.set_source(('torch', i), tx, ty, TORCH_RADIUS)
+
+    def find_empty_space_away_from_player(self):
+        # Drawn from the level's free-cell index in bounded time, more than 4 tiles away on either axis.
+        # Enemies walk off their spawn tile, so it is left in the index
+        return self.free_cells.sample_band(chebyshev((self.player.x, self.player.y)), 5, take=False)
+
+    def start(self, now):
+        self.start_time = now  # Start the timer
+        self.enemy_spawn_time = now  # Initialize the enemy spawn time
+
+    def step(self, action, now):
+        if self.outcome is not None:
+            return
+
+        if action & TORCH:
+            self.drop_torch()
+        if action & SHOOT and self.bullets > 0:
+            self.shoot()
+
+        if now - self.last_move_time > MOVE_DELAY:
+            for flag, (dx, dy) in MOVES:
+                if action & flag:
+                    self.player.move(dx, dy, self.maze)
+                    self.last_move_time = now
+                    self.last_move_direction = (dx, dy)
+
+        self.visibility.set_source('player', self.player.x, self.player.y, PLAYER_RADIUS)
+        profiler = self.profiler
+        if profiler:
+            profiler.lap('input')
+
+        if now - self.last_enemy_move_time > ENEMY_MOVE_DELAY:
+            patrol_all(self.patrolling_enemies, self.distance_field.open, self.width, self.occupancy, self.rng)
+            self.last_enemy_move_time = now
+        if profiler:
+            profiler.lap('patrol')
+
+        if now - self.last_minotaur_move_time > self.minotaur_speed:
+            if self.has_key and now - self.last_minotaur_hit_time > MINOTAUR_PAUSE:
+                self.distance_field.update(self.player.x, self.player.y)
+                for minotaur in self.minotaurs:
+                    minotaur.chase(self.maze, self.player, self.occupancy, self.distance_field)
+            self.last_minotaur_move_time = now
+        if profiler:
+            profiler.lap('chase')
+
+        self.update_bullets()
+        if profiler:
+            profiler.lap('bullets')
+
+        # Spawn new enemy every 10 seconds if there are less than the maximum number of patrolling enemies
+        if now - self.enemy_spawn_time > ENEMY_SPAWN_DELAY and len(self.patrolling_enemies) < self.max_patrolling_enemies:
+            enemy = PatrollingEnemy(*self.find_empty_space_away_from_player())
+            self.patrolling_enemies.append(enemy)
+            self.occupancy.add(enemy.layer, (enemy.x, enemy.y), enemy)
+            self.enemy_spawn_time = now
+
+        if (self.player.x, self.player.y) == self.key_pos:
+            self.has_key = True
+            self.key_pos = None
+            self.events.append('roar')
+            self.minotaurs_spring_to_life_message_displayed = True
+            self.minotaurs_message_start_time = now
+
+        if (self.player.x, self.player.y) == self.exit_pos and self.has_key:
+            elapsed_time = self.elapsed(now)
+            score = self.calculate_score(elapsed_time)
+            self.result = (elapsed_time, self.enemies_killed, score)
+            self.events.append('win')
+            self.level += 1
+            if self.level < len(self.levels):
+                self.setup_level()
+                self.events.append('level')
+            else:
+                self.outcome = f"You escaped the dungeon in {elapsed_time:.2f} seconds! Score: {score:.2f}"
+                return
+
+        player_pos = (self.player.x, self.player.y)
+        if self.has_key:
+            for minotaur in self.occupancy.get('minotaur', player_pos):
+                self.hit_points -= 1
+                self.last_minotaur_hit_time = now
+                self.events.append('hit')
+                if self.hit_points <= 0:
+                    self.lose(now, "The minotaur caught you!")
+                    return
+
+        for enemy in self.occupancy.get('enemy', player_pos):
+            self.hit_points -= 1
+            self.events.append('hit')
+            if self.hit_points <= 0:
+                self.lose(now, "A patrolling enemy caught you!")
+                return
+
+        for ammo in list(self.occupancy.get('ammo', player_pos)):
+            self.bullets += 3
+            self.ammo_positions.remove(player_pos)
+            self.occupancy.remove('ammo', player_pos)
+            self.events.append('ammo')
+
+        # Clear the "minotaurs spring to life" message after the specified duration
+        if self.minotaurs_spring_to_life_message_displayed and (now - self.minotaurs_message_start_time > MESSAGE_DURATION):
+            self.minotaurs_spring_to_life_message_displayed = False
+
+    def lose(self, now, message):
+        self.result = (self.elapsed(now), self.enemies_killed, 0)
+        self.events.append('lose')
+        self.outcome = message
+
+    def elapsed(self, now):
+        return (now - self.start_time) / 1000
+
+    def shoot(self):
+        bullet_dx, bullet_dy = self.last_move_direction
+        slot = self.projectiles.spawn(self.player.x, self.player.y, bullet_dx, bullet_dy)
+        if slot is None:
+            return  # Too many bullets in flight already
+        self.bullets -= 1
+        self.occupancy.add('bullet', (self.player.x, self.player.y), slot)
+        self.events.append('gun')
+
+    def drop_torch(self):
+        if self.torches > 0:
+            self.torches -= 1
+            self.visibility.set_source(('torch', len(self.torch_positions)), self.player.x, self.player.y, TORCH_RADIUS)
+            self.torch_positions.append((self.player.x, self.player.y))
+            self.occupancy.add('torch', (self.player.x, self.player.y))
+            self.events.append('torch')
+
+    def update_bullets(self):
+        # The distance field's open-tile mask doubles as the wall grid bullets fly through
+        self.projectiles.advance(self.distance_field.open, self.width, self.occupancy, self.bullet_hit)
+
+    def bullet_hit(self, pos):
+        # Damages whatever the bullet reached at pos; returns True when that stops the bullet
+        minotaurs = self.occupancy.get('minotaur', pos) if self.has_key else ()  # Only damage if the key is collected
+        enemies = self.occupancy.get('enemy', pos)
+        if minotaurs:
+            minotaur = minotaurs[0]
+            minotaur.hp -= 1
+            if minotaur.hp <= 0:
+                self.kill(minotaur)
+                self.minotaurs.remove(minotaur)
+                return True
+            return False
+        if enemies:
+            enemy = enemies[0]
+            self.kill(enemy)
+            self.patrolling_enemies.remove(enemy)
+            self.enemies_killed += 1
+            return True
+        return False
+
+    def kill(self, entity):
+        pos = (entity.x, entity.y)
+        self.occupancy.remove(entity.layer, pos, entity)
+        self.decals.stamp('body', *pos)
+        for spot in self.generate_blood(*pos):
+            self.decals.stamp('blood', *spot)
+        self.events.append('death')
+
+    def generate_blood(self, x, y):
+        blood = [(x, y)]
+        for _ in range(10):  # Increase the number of blood spots
+            blood.append((x + self.rng.randint(-1, 1), y + self.rng.randint(-1, 1)))
+        return blood
+
+    def calculate_score(self, elapsed_time):
+        score = (self.enemies_killed * 100) / elapsed_time
+        return score
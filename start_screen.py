@@ -1,5 +1,7 @@
 import pygame
-import json
+from glyphs import GlyphAtlas
+from scorestore import open_scores
+from screens import run_modal, centered, score_lines
 
 FONT_SIZE = 24
 SCREEN_WIDTH = 800
@@ -9,61 +11,38 @@ class StartScreen:
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.Font(None, FONT_SIZE)
-        self.scores_file = 'scores.json'
+        self.glyphs = GlyphAtlas(self.font)
+        self.scores = open_scores()
 
     def show(self):
-        while True:
-            self.screen.fill((0, 0, 0))
-            title = self.font.render("Escape the Minotaur!", True, (255, 255, 255))
-            instruction = self.font.render("Press Enter to Start", True, (255, 255, 255))
-            view_scores = self.font.render("Press S to View Scores", True, (255, 255, 255))
-            controls = self.font.render("Controls: W, A, S, D to move, SPACE to shoot, F to drop torch", True, (255, 255, 255))
-            self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, SCREEN_HEIGHT // 3))
-            self.screen.blit(instruction, (SCREEN_WIDTH // 2 - instruction.get_width() // 2, SCREEN_HEIGHT // 2))
-            self.screen.blit(view_scores, (SCREEN_WIDTH // 2 - view_scores.get_width() // 2, SCREEN_HEIGHT // 2 + 30))
-            self.screen.blit(controls, (SCREEN_WIDTH // 2 - controls.get_width() // 2, SCREEN_HEIGHT // 2 + 60))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        return "start"
-                    if event.key == pygame.K_s:
-                        return "scores"
+        # "start", "scores" or QUIT; closing the window is left to the caller
+        return run_modal(self.screen, self.draw_title, {pygame.K_RETURN: "start", pygame.K_s: "scores"})
+
+    def draw_title(self):
+        self.screen.fill((0, 0, 0))
+        title = self.glyphs.text("Escape the Minotaur!", (255, 255, 255))
+        instruction = self.glyphs.text("Press Enter to Start", (255, 255, 255))
+        view_scores = self.glyphs.text("Press S to View Scores", (255, 255, 255))
+        controls = self.glyphs.text("Controls: W, A, S, D to move, SPACE to shoot, F to drop torch", (255, 255, 255))
+        self.screen.blit(title, centered(self.screen, title, SCREEN_HEIGHT // 3))
+        self.screen.blit(instruction, centered(self.screen, instruction, SCREEN_HEIGHT // 2))
+        self.screen.blit(view_scores, centered(self.screen, view_scores, SCREEN_HEIGHT // 2 + 30))
+        self.screen.blit(controls, centered(self.screen, controls, SCREEN_HEIGHT // 2 + 60))
 
     def display_scores(self):
-        while True:
-            self.screen.fill((0, 0, 0))
-            title = self.font.render("Top Scores", True, (255, 255, 255))
-            self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
+        # Redrawn only when a new score has been saved since the last paint
+        return run_modal(self.screen, self.draw_scores, {pygame.K_b: "back"}, version=lambda: self.scores.count)
 
-            top_scores = self.get_top_scores()
-            for i, score in enumerate(top_scores):
-                score_text = f"{i+1}. {score['datetime']} - Time: {score['time']:.2f}s, Enemies: {score['enemies_killed']}, Score: {score['score']:.2f}"
-                score_render = self.font.render(score_text, True, (255, 255, 255))
-                self.screen.blit(score_render, (10, 60 + i * 30))
+    def draw_scores(self):
+        self.screen.fill((0, 0, 0))
+        title = self.glyphs.text("Top Scores", (255, 255, 255))
+        self.screen.blit(title, centered(self.screen, title, 20))
 
-            exit_text = self.font.render("Press B to go back", True, (255, 255, 255))
-            self.screen.blit(exit_text, (SCREEN_WIDTH // 2 - exit_text.get_width() // 2, SCREEN_HEIGHT - 50))
-            pygame.display.flip()
+        for surface, pos in score_lines(self.glyphs, self.get_top_scores(), 10, 60, 30):
+            self.screen.blit(surface, pos)
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_b:
-                        return
+        exit_text = self.glyphs.text("Press B to go back", (255, 255, 255))
+        self.screen.blit(exit_text, centered(self.screen, exit_text, SCREEN_HEIGHT - 50))
 
     def get_top_scores(self):
-        try:
-            with open(self.scores_file, 'r') as file:
-                scores = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-        scores = sorted(scores, key=lambda x: x['score'], reverse=True)
-        return scores[:10]
+        return self.scores.top()
@@ -0,0 +1,96 @@
+import array
+
+from maze import WALL
+
+# Multipliers that map the first octant onto the other seven
+OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+class Visibility:
+    """ Fog-of-war mask for one level, updated only when a light source moves or is added """
+    def __init__(self, maze, width, height, line_of_sight=True):
+        self.maze = maze
+        self.width = width
+        self.height = height
+        self.line_of_sight = line_of_sight
+        self.lit = array.array('H', bytes(2 * width * height))  # Number of sources lighting each tile
+        self.sources = {}
+        self.cache = {}  # Tiles lit from each (x, y, radius), computed once per level
+        self.changed = set()
+
+    def set_source(self, key, x, y, radius):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"light source {key} at {(x, y)} is outside the {self.width}x{self.height} map")
+        source = (x, y, radius)
+        old = self.sources.get(key)
+        if old == source:
+            return
+        if old is not None:
+            for i in self.lit_tiles(*old):
+                self.lit[i] -= 1
+                if not self.lit[i]:
+                    self.changed.add(i)
+        self.sources[key] = source
+        for i in self.lit_tiles(*source):
+            if not self.lit[i]:
+                self.changed.add(i)
+            self.lit[i] += 1
+
+    def is_visible(self, x, y):
+        return self.lit[y * self.width + x] > 0
+
+    def drain(self):
+        # Tiles whose visibility may have flipped since the last call, as (x, y)
+        changed, self.changed = self.changed, set()
+        return [(i % self.width, i // self.width) for i in changed]
+
+    def lit_tiles(self, x, y, radius):
+        key = (x, y, radius)
+        tiles = self.cache.get(key)
+        if tiles is None:
+            if self.line_of_sight:
+                tiles = {y * self.width + x}
+                for xx, xy, yx, yy in OCTANTS:
+                    self.cast(tiles, x, y, radius, 1, 1.0, 0.0, xx, xy, yx, yy)
+                tiles = tuple(tiles)
+            else:
+                tiles = tuple(ty * self.width + tx
+                              for ty in range(max(0, y - radius), min(self.height, y + radius + 1))
+                              for tx in range(max(0, x - radius), min(self.width, x + radius + 1)))
+            self.cache[key] = tiles
+        return tiles
+
+    def cast(self, tiles, cx, cy, radius, row, start, end, xx, xy, yx, yy):
+        # Recursive shadowcasting over one octant; walls are lit but hide what is behind them
+        if start < end:
+            return
+        new_start = start
+        for j in range(row, radius + 1):
+            dx, dy = -j - 1, -j
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                x, y = cx + dx * xx + dy * xy, cy + dx * yx + dy * yy
+                left_slope, right_slope = (dx - 0.5) / (dy + 0.5), (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                inside = 0 <= x < self.width and 0 <= y < self.height
+                if inside:
+                    tiles.add(y * self.width + x)
+                opaque = not inside or self.maze[y][x] == WALL
+                if blocked:
+                    if opaque:
+                        new_start = right_slope
+                        continue
+                    blocked = False
+                    start = new_start
+                elif opaque and j < radius:
+                    blocked = True
+                    self.cast(tiles, cx, cy, radius, j + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break